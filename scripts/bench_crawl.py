@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+bench_crawl.py — Crawl throughput benchmark against the local fixture site.
+
+Starts a ``fixture_site.FixtureSite`` (configurable size, link density,
+latency, 429/5xx injection and large pages) and runs ``crawler.crawl_docs``
+in each crawl mode against it. Every mode runs in its own child process,
+so CPU time and peak RSS belong to that crawl alone and not to the server
+or to earlier modes.
+
+Reported per mode:
+
+  pages_per_sec           pages crawled / wall-clock seconds
+  fetch_p50_ms, p95_ms    per-page fetch time (request, retries, parse)
+  cpu_seconds             user + system CPU of the crawling process
+  peak_rss_kb             peak resident set size of the crawling process
+  bytes_written           bytes of files created or rewritten in scraped_docs
+  phases                  p50/p95 per fetch phase (see crawl_timing.py)
+  server                  requests, connections and statuses seen by the site
+
+Results are printed (and with ``--output`` saved) as JSON, tagged with the
+git commit, so runs can be compared between commits with ``--baseline``.
+
+Usage:
+    python scripts/bench_crawl.py                          # all modes, 200 pages
+    python scripts/bench_crawl.py --pages 500 --latency-ms 20 --rate-429 0.01
+    python scripts/bench_crawl.py --modes sequential,concurrent --output bench.json
+    python scripts/bench_crawl.py --baseline bench.json    # compare against a saved run
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import crawler
+from fixture_site import FixtureSite
+
+SCRIPT = os.path.abspath(__file__)
+
+# mode -> crawl_docs keyword arguments (on top of the common ones)
+MODES = {
+    "sequential": {"concurrency": 1},
+    "concurrent": {"concurrency": 8},
+    "adaptive": {"concurrency": 8, "adaptive": True},
+    "markdown": {"concurrency": 8, "extract": "markdown"},
+    "lxml": {"concurrency": 8, "parser": "lxml"},
+    "no_sitemap": {"concurrency": 8, "use_sitemap": False},
+    "check_links": {"concurrency": 8, "check_links": True},
+    # second crawls over the first one's output
+    "recrawl": {"concurrency": 8},                           # skipped by sitemap lastmod
+    "revalidate": {"concurrency": 8, "use_sitemap": False},  # conditional GETs
+}
+RECRAWL_MODES = ("recrawl", "revalidate")
+
+
+# ---------------------------------------------------------------------------
+# Child process: one measured crawl
+# ---------------------------------------------------------------------------
+
+def _snapshot(path: str) -> dict[str, tuple[int, int]]:
+    files = {}
+    for root, _dirs, names in os.walk(path):
+        for name in names:
+            fpath = os.path.join(root, name)
+            with contextlib.suppress(OSError):
+                st = os.stat(fpath)
+                files[fpath] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def run_crawl(start_url: str, out_dir: str, pages: int, delay: float, kwargs: dict) -> dict:
+    """Run one crawl in this process and measure it."""
+    fetch_seconds: list[float] = []
+    fetch_page = crawler.fetch_page
+
+    def timed_fetch_page(*args, **kw):
+        result = fetch_page(*args, **kw)
+        fetch_seconds.append(result["seconds"])
+        return result
+
+    crawler.fetch_page = timed_fetch_page
+    before = _snapshot(out_dir)
+    cpu_before = os.times()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = crawler.crawl_docs(start_url, "/docs/", out_dir, max_pages=pages, delay=delay, **kwargs)
+    elapsed = time.perf_counter() - started
+    cpu_after = os.times()
+    after = _snapshot(out_dir)
+
+    return {
+        "pages": summary["pages_crawled"],
+        "errors": summary["errors"],
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(summary["pages_crawled"] / elapsed, 2) if elapsed > 0 else None,
+        "fetches": len(fetch_seconds),
+        "fetch_p50_ms": None if not fetch_seconds else round(_percentile(fetch_seconds, 50) * 1000, 2),
+        "fetch_p95_ms": None if not fetch_seconds else round(_percentile(fetch_seconds, 95) * 1000, 2),
+        "cpu_seconds": round((cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system), 3),
+        "peak_rss_kb": crawler.peak_rss_kb(),
+        "bytes_written": sum(size for fpath, (size, mtime) in after.items() if before.get(fpath) != (size, mtime)),
+        "http_cache": summary["http_cache"],
+        "phases": {phase: {"p50_ms": h.get("p50_ms"), "p95_ms": h.get("p95_ms")}
+                   for phase, h in summary["phases"].items() if h["count"]},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Parent process: fixture site + one child per mode
+# ---------------------------------------------------------------------------
+
+def _child(mode: str, start_url: str, out_dir: str, args) -> dict:
+    cmd = [sys.executable, SCRIPT, "--child", mode, "--url", start_url, "--out", out_dir,
+           "--pages", str(args.pages), "--delay", str(args.delay)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(SCRIPT))
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} crawl failed:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_mode(site: FixtureSite, mode: str, args) -> dict:
+    out_dir = tempfile.mkdtemp(prefix=f"bench_crawl_{mode}_")
+    try:
+        if mode in RECRAWL_MODES:
+            _child(mode, site.start_url, out_dir, args)  # prime: not measured
+        site.reset_stats()
+        result = _child(mode, site.start_url, out_dir, args)
+        result["server"] = site.stats()
+        return result
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def git_commit() -> str | None:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(SCRIPT), timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return proc.stdout.strip() or None
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """Per-mode ratios against a saved run (> 1 means this run is higher)."""
+    ratios = {}
+    for mode, current in results["modes"].items():
+        before = baseline.get("modes", {}).get(mode)
+        if not before or "skipped" in current or "skipped" in before:
+            continue
+        ratios[mode] = {
+            key: round(current[key] / before[key], 3)
+            for key in ("pages_per_sec", "fetch_p95_ms", "cpu_seconds", "peak_rss_kb")
+            if current.get(key) and before.get(key)
+        }
+    return {"baseline_commit": baseline.get("commit"), "ratios": ratios}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark crawl modes against a local fixture site.")
+    ap.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes (default: all).")
+    ap.add_argument("--pages", type=int, default=200, help="Fixture pages, all crawled (default: 200).")
+    ap.add_argument("--links", type=int, default=5, help="Internal links per page (default: 5).")
+    ap.add_argument("--external", type=int, default=2, help="External links per page (default: 2).")
+    ap.add_argument("--latency-ms", type=float, default=5.0, help="Server latency per request (default: 5).")
+    ap.add_argument("--jitter-ms", type=float, default=5.0, help="Extra random latency, 0..N ms (default: 5).")
+    ap.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered 429.")
+    ap.add_argument("--rate-5xx", type=float, default=0.0, help="Fraction of requests answered 503.")
+    ap.add_argument("--large-every", type=int, default=25, help="Pad every Nth page (default: 25).")
+    ap.add_argument("--large-kb", type=int, default=512, help="Size of padded pages in KiB (default: 512).")
+    ap.add_argument("--delay", type=float, default=0.0, help="Crawler per-host delay (default: 0).")
+    ap.add_argument("--output", help="Also write the JSON results to this file.")
+    ap.add_argument("--baseline", help="Saved results to compare against.")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("--url", help=argparse.SUPPRESS)
+    ap.add_argument("--out", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(run_crawl(args.url, args.out, args.pages, args.delay, MODES[args.child])))
+        return
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        ap.error(f"unknown mode(s): {', '.join(unknown)} (choose from {', '.join(MODES)})")
+
+    config = {k: getattr(args, k) for k in ("pages", "links", "external", "latency_ms", "jitter_ms",
+                                             "rate_429", "rate_5xx", "large_every", "large_kb", "delay")}
+    results = {"commit": git_commit(), "python": sys.version.split()[0], "config": config, "modes": {}}
+    with FixtureSite(
+        pages=args.pages, links=args.links, external=args.external,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        large_every=args.large_every, large_kb=args.large_kb,
+    ) as site:
+        for mode in modes:
+            if mode == "lxml" and "lxml" not in crawler.PARSER_BACKENDS:
+                results["modes"][mode] = {"skipped": "lxml not installed"}
+                continue
+            print(f"⏱️  {mode}...", file=sys.stderr)
+            results["modes"][mode] = bench_mode(site, mode, args)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fin:
+            results["comparison"] = compare(results, json.load(fin))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fout:
+            fout.write(output + "\n")
+    print(output)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
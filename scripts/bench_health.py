@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+bench_health.py — health_check.py benchmark over a synthetic docs tree.
+
+Generates a seeded tree of doc repos (default: 4 repos, 10,000 markdown
+files in total) with headings, prose, code blocks, internal links (some
+with anchors, some broken) and the occasional stub marker, some of them in
+headings, then measures:
+
+  scanner     the per-file text scan alone, on contents already in memory:
+              the old multi-pass scan (lowercase copy, one ``re.search``
+              per stub marker, ``re.findall`` for links, strip/split for
+              lines) against ``health_check.scan_text``'s single pass, which
+              also indexes heading anchors. Both must agree on markers, links
+              and line counts.
+  check       full ``health_check.check_repos`` runs over the tree: without
+              the cache at one job and at ``--jobs``, then with a cold and
+              a warm result cache.
+
+Results are printed (and with ``--output`` saved) as JSON.
+
+Usage:
+    python scripts/bench_health.py                     # 10k files
+    python scripts/bench_health.py --files 2000 --repeat 5
+    python scripts/bench_health.py --jobs 8 --output bench_health.json
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import health_check
+
+WORDS = (
+    "the cli supports commands flags options config settings session model tool agent workspace "
+    "file project request response token stream output input server client extension theme "
+    "Todos pending-approval shell sandbox memory context checkpoint telemetry auth api key"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Synthetic tree
+# ---------------------------------------------------------------------------
+
+def make_doc(rng: random.Random, i: int, files: int) -> str:
+    lines = [f"# Document {i}", ""]
+    for section in range(rng.randint(1, 8)):
+        lines += [f"## Section {section}", ""]
+        for _ in range(rng.randint(1, 6)):
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))).capitalize() + ".")
+        if rng.random() < 0.5:
+            target = f"doc{rng.randrange(files)}.md" if rng.random() < 0.9 else f"missing{rng.randrange(50)}.md"
+            anchor = f"#section-{rng.randrange(10)}" if rng.random() < 0.3 else ""
+            lines.append(f"See [the {rng.choice(WORDS)} guide](./{target}{anchor}) for details.")
+        if rng.random() < 0.3:
+            lines += ["", "```bash", f"gemini --{rng.choice(WORDS)} {rng.choice(WORDS)}", "```"]
+        lines.append("")
+    if rng.random() < 0.05:
+        lines.append(rng.choice(["TODO: fill in", "Coming soon.", "This page is a stub.", "Details TBD."]))
+    if rng.random() < 0.05:
+        # Markers and links inside headings must be seen too
+        lines += ["", rng.choice([
+            "### Coming soon", "# TODO: document the flags", "## Placeholder #",
+            f"## See [setup](./doc{rng.randrange(files)}.md)", f"### [Next](./doc{rng.randrange(files)}.md#section-1) TBD",
+        ]), ""]
+    return "\n".join(lines) + "\n"
+
+
+def make_tree(root: Path, repos: int, files: int, seed: int) -> list[str]:
+    """Write *files* docs spread over *repos* repos; returns the repo names."""
+    rng = random.Random(seed)
+    names = [f"Repo{r}" for r in range(repos)]
+    per_repo = files // repos
+    for r, name in enumerate(names):
+        docs = root / name / "docs"
+        docs.mkdir(parents=True)
+        (root / name / "VERSION.md").write_text("Version: 1.0\n", encoding="utf-8")
+        (root / name / "JULES.md").write_text("# Jules\n", encoding="utf-8")
+        count = per_repo + (files % repos if r == repos - 1 else 0)
+        for i in range(count):
+            (docs / f"doc{i}.md").write_text(make_doc(rng, i, count), encoding="utf-8")
+    return names
+
+
+# ---------------------------------------------------------------------------
+# Scanner micro-benchmark
+# ---------------------------------------------------------------------------
+
+def legacy_scan(content: str) -> dict:
+    """The scan health_check.py did before scan_text: one pass per question (no anchor index)."""
+    line_count = len(content.strip().split("\n"))
+    content_lower = content.lower()
+    markers = [m for m in health_check.STUB_MARKERS if re.search(r'\b' + re.escape(m) + r'\b', content_lower)]
+    links = re.findall(r'\[.*?\]\(\./([^)]+)\)', content)
+    return {"line_count": line_count, "markers": markers, "links": links}
+
+
+def _same(legacy: dict, single: dict) -> bool:
+    return all(single[key] == value for key, value in legacy.items())
+
+
+def _best_of(fn, contents: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for content in contents:
+            fn(content)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_scanner(contents: list[str], repeat: int) -> dict:
+    mismatches = sum(not _same(legacy_scan(c), health_check.scan_text(c)) for c in contents)
+    total_mb = sum(len(c) for c in contents) / 1e6
+    results = {"files": len(contents), "mb": round(total_mb, 2), "mismatches": mismatches}
+    for label, fn in (("legacy", legacy_scan), ("single_pass", health_check.scan_text)):
+        seconds = _best_of(fn, contents, repeat)
+        results[label] = {"seconds": round(seconds, 4), "files_per_sec": round(len(contents) / seconds),
+                          "mb_per_sec": round(total_mb / seconds, 1)}
+    results["speedup"] = round(results["legacy"]["seconds"] / results["single_pass"]["seconds"], 2)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# End-to-end checks
+# ---------------------------------------------------------------------------
+
+def bench_check(root: Path, repos: list[str], jobs: int) -> dict:
+    health_check.ROOT = root
+    cache_path = root / health_check.CACHE_FILE.name
+    runs = {}
+
+    def timed(label: str, **kwargs) -> None:
+        started = time.perf_counter()
+        health_check.check_repos(repos, **kwargs)
+        runs[label] = {"seconds": round(time.perf_counter() - started, 3)}
+        if kwargs.get("cache"):
+            runs[label]["cache"] = kwargs["cache"].stats()
+            kwargs["cache"].save()
+
+    timed("no_cache_jobs1", jobs=1)
+    if jobs > 1:
+        timed(f"no_cache_jobs{jobs}", jobs=jobs)
+    cache_path.unlink(missing_ok=True)
+    timed("cache_cold", jobs=jobs, cache=health_check.ResultCache(cache_path))
+    timed("cache_warm", jobs=jobs, cache=health_check.ResultCache(cache_path))
+    return runs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark health_check.py over a synthetic docs tree.")
+    ap.add_argument("--files", type=int, default=10_000, help="Markdown files in total (default: 10000).")
+    ap.add_argument("--repos", type=int, default=4, help="Repos to spread them over (default: 4).")
+    ap.add_argument("--repeat", type=int, default=3, help="Scanner passes; the best is kept (default: 3).")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="Worker processes for the parallel check (default: one per CPU).")
+    ap.add_argument("--seed", type=int, default=0, help="Tree generator seed (default: 0).")
+    ap.add_argument("--scanner-only", action="store_true", help="Skip the end-to-end check runs.")
+    ap.add_argument("--output", help="Also write the JSON results to this file.")
+    args = ap.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench_health_"))
+    try:
+        print(f"📝 Writing {args.files} docs...", file=sys.stderr)
+        repos = make_tree(root, args.repos, args.files, args.seed)
+        contents = [p.read_text(encoding="utf-8") for p in sorted(root.glob("*/docs/*.md"))]
+        results = {"python": sys.version.split()[0], "config": vars(args).copy()}
+
+        print("⏱️  scanner...", file=sys.stderr)
+        results["scanner"] = bench_scanner(contents, args.repeat)
+        if not args.scanner_only:
+            print("⏱️  check_repos...", file=sys.stderr)
+            jobs = health_check.resolve_jobs(args.jobs, args.files)
+            results["check"] = bench_check(root, repos, jobs)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fout:
+            fout.write(output + "\n")
+    print(output)
+    sys.exit(1 if results["scanner"]["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+bench_http.py — Count TCP handshakes per crawl against a local stand-in server.
+
+Starts the local keep-alive fixture site (see fixture_site.py), then
+fetches every page:
+
+  before_urllib     one ``urllib.request.urlopen`` per page (a new connection each time)
+  after_http_pool   the same fetch loop through an ``http_pool.ConnectionPool``
+  crawl             ``crawler.crawl_docs`` over the site, which goes through
+                    the shared pool (connection counts only: its time also
+                    covers sitemap, parsing and writes, so it isn't comparable)
+
+The server counts accepted connections, so the numbers are independent of
+client-side bookkeeping. Seconds are reported only for the two fetch loops.
+
+Usage:
+    python scripts/bench_http.py               # 100 pages
+    python scripts/bench_http.py --pages 300 --concurrency 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import urllib.request
+
+import crawler
+import http_pool
+from fixture_site import FixtureSite
+
+
+def bench_urllib(base: str, pages: int) -> int:
+    """Fetch every page with a fresh urlopen, as the crawler used to."""
+    for i in range(pages):
+        with urllib.request.urlopen(f"{base}/docs/p{i}", timeout=15) as resp:
+            resp.read()
+    return pages
+
+
+def bench_pool(base: str, pages: int) -> int:
+    """The same fetch loop through a fresh keep-alive pool."""
+    pool = http_pool.ConnectionPool()
+    try:
+        for i in range(pages):
+            with pool.request("GET", f"{base}/docs/p{i}", timeout=15) as resp:
+                resp.read()
+    finally:
+        pool.close()
+    return pages
+
+
+def bench_crawler(base: str, pages: int, concurrency: int, out_dir: str) -> int:
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = crawler.crawl_docs(
+            f"{base}/docs/p0", "/docs/", out_dir,
+            max_pages=pages, delay=0, concurrency=concurrency,
+        )
+    return summary["pages_crawled"]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark handshakes per crawl before/after http_pool.")
+    ap.add_argument("--pages", type=int, default=100, help="Pages per crawl (default: 100).")
+    ap.add_argument("--concurrency", type=int, default=1, help="Crawler concurrency (default: 1).")
+    args = ap.parse_args()
+
+    server = FixtureSite(pages=args.pages, links=3).start()
+    base = server.base_url
+    out_dir = tempfile.mkdtemp(prefix="bench_http_")
+
+    results = {}
+    try:
+        for name, run in (
+            ("before_urllib", lambda: bench_urllib(base, args.pages)),
+            ("after_http_pool", lambda: bench_pool(base, args.pages)),
+            ("crawl", lambda: bench_crawler(base, args.pages, args.concurrency, out_dir)),
+        ):
+            server.reset_stats()
+            started = time.perf_counter()
+            fetched = run()
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                "pages": fetched,
+                "connections": server.connections,
+                "handshakes_per_page": round(server.connections / max(1, fetched), 3),
+            }
+            if name != "crawl":
+                results[name]["seconds"] = round(elapsed, 3)
+    finally:
+        server.stop()
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+bench_parse.py — Parity check and parse-throughput benchmark for crawler backends.
+
+Runs every installed HTML backend in ``crawler.PARSER_BACKENDS`` over a set
+of fixture pages, fed both as one string and in chunks (down to one
+character at a time), and checks
+that the extracted text (and Markdown, see ``crawler.EXTRACTORS``) and
+links match the stdlib ``html.parser`` backend exactly. Then measures parse
+throughput (MB/s) per backend and extraction mode.
+
+The pages are the generated well-formed ones plus the saved pages in
+``data/parse_fixtures/``, which hold the malformed markup real doc sites
+serve (optional end tags left out, stray end tags, ``</br>``, forms inside
+paragraphs). Any difference on the generated pages, or between whole and
+chunked feeding of ``html.parser`` on any page, is a failure. Opt-in
+backends (lxml) repair malformed markup their own way, so their
+differences on the saved pages are listed separately and only fail with
+``--strict``. This is why ``--parser auto`` means ``html.parser``.
+
+Usage:
+    python scripts/bench_parse.py                 # parity + throughput
+    python scripts/bench_parse.py --check         # parity only (exit 1 on mismatch)
+    python scripts/bench_parse.py --check --strict   # opt-in backends must match on saved pages too
+    python scripts/bench_parse.py --fixtures DIR  # saved *.html pages from DIR instead
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import crawler
+
+BASE_URL = "https://docs.example.com/docs/en/page"
+SAVED_FIXTURES = Path(__file__).parent.parent / "data" / "parse_fixtures"
+
+
+def fixture_pages(sections: int = 400) -> dict[str, str]:
+    """Synthetic pages covering the markup the extractor cares about."""
+    nav = "".join(f'<li><a href="/docs/en/p{i}" class="nav">Page {i}</a></li>' for i in range(60))
+    body = []
+    for i in range(sections):
+        body.append(
+            f'<section id="s{i}"><h2 id="h{i}">Section {i}</h2>'
+            f'<p>Plain text with <b>bold</b>, <code>inline code</code> &amp; entities &lt;{i}&gt;.</p>'
+            f'<!-- comment {i} --><p>After comment</p>'
+            f'<pre><code>$ tool --flag {i}\n  indented line</code></pre>'
+            f'<table><tr><th>Key</th><th>Value</th></tr><tr><td>k{i}</td><td>v{i}</td></tr></table>'
+            f'<table><tr><th>K<th>V<tr><td>a{i}<td>b{i}</table>'
+            f'<ul><li>Item <em>{i}</em><ol><li>nested</li></ol></li><li><p>para</p></li></ul>'
+            f'<blockquote><p>Quote {i}</p></blockquote><pre class="language-sh">x = {i}\n</pre>'
+            f'<a href="https://external{i % 7}.example.org/x?i={i}#frag">ext</a> '
+            f'<a href="../en/p{i % 60}/">rel</a> <a href="#local">skip</a> <a href="mailto:x@y">skip</a>'
+            f'<script>var s{i} = "<p>not text</p>";</script><style>.c{i} {{ color: red }}</style>'
+            f'<button>Copy</button></section>'
+        )
+    large = (
+        "<!DOCTYPE html><html><head><title>Fixture</title></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main>{''.join(body)}</main><footer>Footer text</footer></body></html>"
+    )
+    small = (
+        "<html><body><h1>Small page</h1><p>Café — naïve text</p>"
+        '<a href="/docs/en/other">other</a><form><input name="q"></form></body></html>'
+    )
+    return {"large.html": large, "small.html": small}
+
+
+def parse(cls: type, html: str, chunk: int | None,
+          extractor: type = crawler.TextExtractor) -> tuple[str, list[str]]:
+    parser = cls(BASE_URL, extractor_cls=extractor)
+    if chunk is None:
+        parser.feed(html)
+    else:
+        for i in range(0, len(html), chunk):
+            parser.feed(html[i:i + chunk])
+    parser.close()
+    return parser.text, parser.links
+
+
+def saved_pages(directory: Path) -> dict[str, str]:
+    return {f"{directory.name}/{p.name}": p.read_text(encoding="utf-8", errors="replace")
+            for p in sorted(directory.glob("*.html"))}
+
+
+def check_parity(pages: dict[str, str]) -> list[str]:
+    failures = []
+    for name, html in pages.items():
+        for extract, (extractor, _) in crawler.EXTRACTORS.items():
+            ref_text, ref_links = parse(crawler.DocParser, html, None, extractor)
+            for backend, cls in crawler.PARSER_BACKENDS.items():
+                for chunk in (None, 1, 7, 4096):
+                    text, links = parse(cls, html, chunk, extractor)
+                    mode = "whole" if chunk is None else f"chunk={chunk}"
+                    if text != ref_text:
+                        failures.append(f"{name} [{backend}, {extract}, {mode}]: text differs")
+                    if links != ref_links:
+                        failures.append(f"{name} [{backend}, {extract}, {mode}]: links differ")
+    return failures
+
+
+def throughput(pages: dict[str, str], repeat: int) -> dict:
+    total_bytes = sum(len(html.encode()) for html in pages.values())
+    results = {}
+    for backend, cls in crawler.PARSER_BACKENDS.items():
+        for extract, (extractor, _) in crawler.EXTRACTORS.items():
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for html in pages.values():
+                    parse(cls, html, crawler.CHUNK_SIZE, extractor)
+                best = min(best, time.perf_counter() - started)
+            results[f"{backend}/{extract}"] = {
+                "seconds": round(best, 4),
+                "mb_per_second": round(total_bytes / best / 1e6, 2),
+            }
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Parser backend parity check and benchmark.")
+    ap.add_argument("--check", action="store_true", help="Parity check only.")
+    ap.add_argument("--fixtures", type=Path, default=SAVED_FIXTURES,
+                    help="Directory of saved *.html pages (default: data/parse_fixtures).")
+    ap.add_argument("--strict", action="store_true",
+                    help="Fail on opt-in backend differences on the saved pages too.")
+    ap.add_argument("--repeat", type=int, default=5, help="Timing repetitions (default: 5).")
+    args = ap.parse_args()
+
+    generated = fixture_pages()
+    saved = saved_pages(args.fixtures)
+    pages = {**generated, **saved}
+
+    failures, differences = check_parity(generated), []
+    default = crawler.resolve_backend("auto")
+    for failure in check_parity(saved):
+        backend = failure.split("[", 1)[1].split(",", 1)[0]
+        if args.strict or crawler.PARSER_BACKENDS[backend] is default:
+            failures.append(failure)
+        else:
+            differences.append(failure)
+    report = {
+        "backends": list(crawler.PARSER_BACKENDS),
+        "pages": len(pages),
+        "parity_failures": failures,
+        "opt_in_backend_differences": differences,
+    }
+    if not args.check:
+        report["throughput"] = throughput(pages, args.repeat)
+
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,8 @@ import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from pathlib import Path
 
+import http_pool
+
 ROOT = Path(__file__).parent.parent
 DATA_FILE = ROOT / "data" / "last_releases.json"
 REPOS_FILE = ROOT / "repos.json"
@@ -52,7 +54,7 @@ def fetch_latest_release(feed_url: str) -> dict | None:
             feed_url,
             headers={"User-Agent": "DocMaintainer-ReleaseWatcher/1.0"},
         )
-        with urllib.request.urlopen(req, timeout=15) as resp:
+        with http_pool.urlopen(req, timeout=15, retry=http_pool.RetryPolicy()) as resp:
             xml_data = resp.read().decode()
     except (urllib.error.URLError, urllib.error.HTTPError) as e:
         print(f"  ⚠️ Feed fetch failed: {e}", file=sys.stderr)
@@ -0,0 +1,132 @@
+"""
+crawl_timing.py — Per-phase fetch timing and Chrome trace export for the crawler.
+
+Every page fetch is split into phases:
+
+  queue     waiting in the worker pool after being dequeued
+  throttle  waiting for the host's politeness token (Crawl-delay, Retry-After)
+  retry     backing off between attempts after a failed request
+  connect   DNS + TCP + TLS for a new connection (0 on a reused one)
+  ttfb      request sent → response headers received
+  download  reading the body off the socket
+  parse     HTML parsing and text extraction
+  write     writing the extracted text and committing it to scraped_docs
+
+``PhaseTimers`` folds the per-page numbers into histograms for
+``_crawl_meta.json``; ``TraceRecorder`` keeps every span and writes a Chrome
+trace-event file that opens in https://ui.perfetto.dev (or
+chrome://tracing), one track per crawl worker.
+
+Usage:
+    from crawl_timing import PhaseTimers, TraceRecorder
+
+    timers = PhaseTimers()
+    timers.add({"ttfb": 0.120, "parse": 0.004})
+    timers.to_dict()   # {"ttfb": {"count": 1, "p50_ms": 120.0, ...}, ...}
+
+    trace = TraceRecorder()
+    trace.span("ttfb", "fetch-0", start, end, {"url": url})
+    trace.write("scraped_docs/_crawl_trace.json")
+"""
+
+import json
+import threading
+import time
+
+PHASES = ("queue", "throttle", "retry", "connect", "ttfb", "download", "parse", "write")
+# Histogram bucket upper bounds in milliseconds; a final bucket catches the rest
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+TRACE_FILE = "_crawl_trace.json"
+
+
+class Histogram:
+    """Fixed log-scale buckets plus exact percentiles over the raw samples."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.samples: list[float] = []   # milliseconds
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.samples.append(ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def _percentile(self, ordered: list[float], pct: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def to_dict(self) -> dict:
+        if not self.samples:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": len(ordered),
+            "total_ms": round(sum(ordered), 2),
+            "mean_ms": round(sum(ordered) / len(ordered), 3),
+            "p50_ms": round(self._percentile(ordered, 50), 3),
+            "p95_ms": round(self._percentile(ordered, 95), 3),
+            "max_ms": round(ordered[-1], 3),
+            "buckets_ms": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class PhaseTimers:
+    """One histogram per phase, fed one page's ``{phase: seconds}`` at a time."""
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in PHASES}
+
+    def add(self, timings: dict[str, float]) -> None:
+        for phase, seconds in timings.items():
+            if seconds is not None and phase in self.phases:
+                self.phases[phase].add(seconds)
+
+    def to_dict(self) -> dict:
+        return {phase: hist.to_dict() for phase, hist in self.phases.items()}
+
+
+class TraceRecorder:
+    """Collects complete ("X") trace events; timestamps are ``time.perf_counter()`` values."""
+
+    def __init__(self, origin: float | None = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self._lock = threading.Lock()
+        self._events: list[dict] = []
+        self._tids: dict[str, int] = {}
+
+    def _tid(self, thread: str) -> int:
+        if thread not in self._tids:
+            self._tids[thread] = len(self._tids) + 1
+        return self._tids[thread]
+
+    def span(self, name: str, thread: str, start: float, end: float, args: dict | None = None) -> None:
+        with self._lock:
+            event = {
+                "name": name,
+                "cat": "crawl",
+                "ph": "X",
+                "pid": 1,
+                "tid": self._tid(thread),
+                "ts": round((start - self.origin) * 1e6, 1),
+                "dur": round(max(0.0, end - start) * 1e6, 1),
+            }
+            if args:
+                event["args"] = args
+            self._events.append(event)
+
+    def write(self, path: str) -> int:
+        """Write the trace file; returns the number of events."""
+        with self._lock:
+            meta = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "crawler"}}]
+            meta += [
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": thread}}
+                for thread, tid in self._tids.items()
+            ]
+            events = meta + sorted(self._events, key=lambda e: e["ts"])
+        with open(path, "w", encoding="utf-8") as fout:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fout)
+        return len(events)
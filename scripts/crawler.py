@@ -7,11 +7,17 @@ to a local directory for offline reference and analysis.
 
 Usage:
     python crawler.py --start-url <URL> --base-path <PATH> --output-repo <DIR>
+    python crawler.py --all-repos [--max-workers N] [--global-concurrency N]
 
 Examples:
     python crawler.py --start-url https://code.claude.com/docs/en/cli-reference --base-path /docs/en/ --output-repo ClaudeCodeDocs
     python crawler.py --start-url https://geminicli.com/docs/ --base-path /docs/ --output-repo GeminiDocs
     python crawler.py --start-url https://developers.openai.com/codex/cli/ --base-path /codex/cli/ --output-repo CodexDocs
+    python crawler.py --start-url https://geminicli.com/docs/ --base-path /docs/ --output-repo GeminiDocs --concurrency 4
+    python crawler.py --all-repos --concurrency 4 --global-concurrency 12
+
+Pages listed in the site's sitemap.xml are queued up front; following
+links between pages still finds anything the sitemap leaves out.
 """
 
 import os
@@ -22,65 +28,566 @@ import urllib.error
 from html.parser import HTMLParser
 import time
 import argparse
+import codecs
+import contextlib
+import hashlib
 import json
+import multiprocessing
+import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
+import http_pool
+import link_checker
+import link_graph
+import sitemap
+from page_store import PageStore, page_header
+from crawl_timing import PHASES, TRACE_FILE, PhaseTimers, TraceRecorder
+from robots import RobotsCache
+from simhash import NearDupIndex, SimHash
+
+try:
+    import resource  # Unix only; peak RSS is simply not reported elsewhere
+except ImportError:
+    resource = None
+
+try:
+    from lxml import etree  # optional faster parser backend
+except ImportError:
+    etree = None
+
 
 # ---------------------------------------------------------------------------
-# HTML Parser
+# HTML extraction
 # ---------------------------------------------------------------------------
+#
+# Extraction is split in two: a *backend* tokenizes HTML and emits
+# start/end/data events, and TextExtractor turns those events into page text
+# and links. Backends bind their callbacks straight to the extractor's
+# methods, so there is no per-event trampoline.
 
-class DocParser(HTMLParser):
-    """Extracts text content and href links from an HTML page."""
+class TextExtractor:
+    """
+    Collects visible text and href links from a stream of parser events.
 
+    Text runs split across several ``data`` events (chunk boundaries,
+    backend quirks) are coalesced before stripping, so the output does not
+    depend on how the page was fed. When *sink* (any object with
+    ``write(str)``) is given, text is streamed to it instead of being kept
+    in ``text_parts``. A sink that also has ``start_section(level, anchor)``
+    and ``name_section(title)`` is told where each heading's section
+    begins (see HashingSink).
+    """
+
+    HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
     IGNORE_TAGS = frozenset({
         "script", "style", "nav", "footer", "header",
         "noscript", "svg", "iframe", "button", "form",
     })
     SKIP_SCHEMES = ("javascript:", "mailto:", "tel:", "#", "data:")
 
-    def __init__(self, base_url: str):
-        super().__init__()
+    def __init__(self, base_url: str, sink=None):
         self.base_url = base_url
         self.links: list[str] = []
         self.text_parts: list[str] = []
         self._tag_stack: list[str] = []
         self._inside_ignored = 0  # depth counter for nested ignored tags
+        self._pending: list[str] = []  # text run not yet terminated by markup
+        self._resolved: dict[str, str] = {}  # href -> absolute URL
+        self._sink = sink
+        self._wrote = False
+        self._sections = hasattr(sink, "start_section")
+        self._title: list[str] | None = None  # text of the heading being read
+
+    @staticmethod
+    def _attr(attrs, name: str) -> str | None:
+        if isinstance(attrs, dict):
+            return attrs.get(name)
+        for key, value in attrs:
+            if key == name:
+                return value
+        return None
+
+    def _heading_start(self, tag: str, attrs) -> None:
+        self._sink.start_section(self.HEADINGS[tag], self._attr(attrs, "id"))
+        self._title = []
 
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
+    def _flush_text(self):
+        text = "".join(self._pending).strip()
+        self._pending.clear()
+        if not text:
+            return
+        if self._title is not None:
+            self._title.append(text)
+        if self._sink is None:
+            self.text_parts.append(text)
+        else:
+            self._sink.write("\n" + text if self._wrote else text)
+            self._wrote = True
+
+    def start(self, tag: str, attrs):
+        """*attrs* is a list of (name, value) pairs or a dict, depending on the backend."""
+        if self._pending:
+            self._flush_text()
         self._tag_stack.append(tag)
         if tag in self.IGNORE_TAGS:
             self._inside_ignored += 1
-
-        if tag == "a":
-            href = dict(attrs).get("href")
+        elif tag in self.HEADINGS and self._sections and not self._inside_ignored:
+            self._heading_start(tag, attrs)
+        elif tag == "a":
+            # Attributes are only inspected on anchors
+            if isinstance(attrs, dict):
+                href = attrs.get("href")
+            else:
+                href = None
+                for name, value in attrs:
+                    if name == "href":
+                        href = value
             if href and not href.startswith(self.SKIP_SCHEMES):
-                full_url, _ = urllib.parse.urldefrag(
-                    urllib.parse.urljoin(self.base_url, href)
-                )
+                # Sidebar navs repeat the same hrefs; resolve each one once
+                full_url = self._resolved.get(href)
+                if full_url is None:
+                    full_url, _ = urllib.parse.urldefrag(
+                        urllib.parse.urljoin(self.base_url, href)
+                    )
+                    self._resolved[href] = full_url
                 self.links.append(full_url)
 
-    def handle_endtag(self, tag: str):
+    def end(self, tag: str):
+        if self._pending:
+            self._flush_text()
+        if self._title is not None and tag in self.HEADINGS:
+            self._sink.name_section(" ".join(self._title))
+            self._title = None
+        stack = self._tag_stack
+        if stack and stack[-1] == tag:
+            # Well-nested markup: O(1) pop
+            stack.pop()
+            if tag in self.IGNORE_TAGS:
+                self._inside_ignored -= 1
+            return
         # Pop back to the matching tag (handles self-closing quirks)
-        while self._tag_stack:
-            popped = self._tag_stack.pop()
+        while stack:
+            popped = stack.pop()
             if popped in self.IGNORE_TAGS:
                 self._inside_ignored = max(0, self._inside_ignored - 1)
             if popped == tag:
                 break
 
-    def handle_data(self, data: str):
-        if self._inside_ignored > 0:
-            return
-        text = data.strip()
-        if text:
-            self.text_parts.append(text)
+    def data(self, data: str):
+        if not self._inside_ignored:
+            self._pending.append(data)
+
+    def boundary(self, *_):
+        """Any other markup (comment, doctype, PI) also ends a text run."""
+        if self._pending:
+            self._flush_text()
+
+    def close(self):
+        if self._pending:
+            self._flush_text()
 
     @property
     def text(self) -> str:
         return "\n".join(self.text_parts)
 
 
+class MarkdownExtractor(TextExtractor):
+    """
+    Emits Markdown instead of plain text, in the same single pass over the
+    parser events: headings, paragraphs, nested lists, block quotes,
+    fenced code blocks (with the ``language-*`` class as info string),
+    tables, links and inline emphasis/code. Only the current block (or
+    table) is buffered; nothing resembling a DOM is built.
+
+    Links are collected exactly as by TextExtractor.
+    """
+
+    BLOCK_TAGS = frozenset({
+        "p", "div", "section", "article", "main", "aside", "details", "summary",
+        "figure", "figcaption", "dl", "dt", "dd", "address", "center",
+    })
+    INLINE_MARKS = {"strong": "**", "b": "**", "em": "_", "i": "_", "code": "`", "kbd": "`"}
+    LINE_BREAK = "\x00"
+
+    def __init__(self, base_url: str, sink=None):
+        super().__init__(base_url, sink)
+        self._buf: list[str] = []
+        self._inline: list[list] = []     # [tag, buffer index, href or mark]
+        self._lists: list[list] = []      # [kind, item count, marker width]
+        self._marker: str | None = None   # list marker waiting for the item's first block
+        self._in_list_block = False       # last emitted block was a list item line
+        self._quote = 0
+        self._heading = 0
+        self._heading_id: str | None = None
+        self._pre = 0
+        self._pre_lang = ""
+        self._table: list[list[str]] | None = None
+        self._table_depth = 0
+        self._cell: int | None = None     # buffer index where the current cell began
+
+    # -- output ---------------------------------------------------------------
+
+    def _emit(self, lines: list[str], first_prefix: str, rest_prefix: str) -> None:
+        quote = "> " * self._quote
+        block = "\n".join(
+            (quote + (first_prefix if i == 0 else rest_prefix) + line).rstrip()
+            for i, line in enumerate(lines)
+        )
+        in_list = bool(self._lists)
+        sep = "\n" if in_list and self._in_list_block and first_prefix.strip() else "\n\n"
+        self._in_list_block = in_list
+        if self._sink is None:
+            self.text_parts.append(block if not self.text_parts else sep + block)
+        else:
+            self._sink.write(sep + block if self._wrote else block)
+            self._wrote = True
+
+    def _prefixes(self) -> tuple[str, str]:
+        """(first line, continuation) prefixes for a block at the current list depth."""
+        indent = "".join(" " * width for _, _, width in self._lists[:-1])
+        if not self._lists:
+            return "", ""
+        width = self._lists[-1][2]
+        if self._marker is not None:
+            first, self._marker = indent + self._marker, None
+            return first, indent + " " * width
+        return indent + " " * width, indent + " " * width
+
+    def _collapse(self, text: str) -> list[str]:
+        lines = (" ".join(part.split()) for part in text.split(self.LINE_BREAK))
+        return [line for line in lines if line]
+
+    def _flush_block(self) -> None:
+        if not self._buf:
+            return
+        if self._cell is not None:
+            self._buf.append(" ")  # blocks inside a table cell stay in the cell
+            return
+        text = "".join(self._buf)
+        self._clear_buf()
+        if self._table is not None:
+            return  # stray text between table rows (captions) is dropped
+        lines = self._collapse(text)
+        if not lines:
+            return
+        if self._heading:
+            title = " ".join(lines)
+            lines = ["#" * self._heading + " " + title]
+            if self._sections:
+                self._sink.start_section(self._heading, self._heading_id)
+                self._sink.name_section(title)
+        first, rest = self._prefixes()
+        self._emit(lines, first, rest)
+
+    def _clear_buf(self) -> None:
+        """Empty the buffer; open inline marks now start at its beginning."""
+        self._buf.clear()
+        for entry in self._inline:
+            entry[1] = 0
+
+    def _flush_pre(self) -> None:
+        code = "".join(self._buf).strip("\n")
+        self._clear_buf()
+        fence = "```"
+        while fence in code:
+            fence += "`"
+        first, rest = self._prefixes()
+        self._emit([fence + self._pre_lang, *code.split("\n"), fence], first, rest)
+
+    def _flush_table(self) -> None:
+        rows = [row for row in self._table if any(cell for cell in row)]
+        self._table = None
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + "---|" * width]
+        lines += ["| " + " | ".join(row) + " |" for row in rows[1:]]
+        first, rest = self._prefixes()
+        self._emit(lines, first, rest)
+
+    # -- parser events ----------------------------------------------------------
+
+    def start(self, tag: str, attrs):
+        links_before = len(self.links)
+        super().start(tag, attrs)
+        if self._inside_ignored:
+            return
+        if self._pre:
+            if tag == "code" and not self._pre_lang:
+                self._pre_lang = self._language(attrs)
+            elif tag == "br":
+                self._buf.append("\n")
+            return
+        if tag in self.HEADINGS:
+            self._flush_block()
+            self._heading = self.HEADINGS[tag]
+            self._heading_id = self._attr(attrs, "id")
+        elif tag in self.BLOCK_TAGS:
+            self._flush_block()
+        elif tag == "li":
+            self._flush_block()
+            if self._lists:
+                kind = self._lists[-1]
+                kind[1] += 1
+                self._marker = f"{kind[1]}. " if kind[0] == "ol" else "- "
+                kind[2] = len(self._marker)
+        elif tag in ("ul", "ol"):
+            self._flush_block()
+            self._lists.append([tag, 0, 2])
+        elif tag == "blockquote":
+            self._flush_block()
+            self._quote += 1
+        elif tag == "pre":
+            self._flush_block()
+            self._pre += 1
+            self._pre_lang = self._language(attrs)
+        elif tag == "br":
+            self._buf.append(self.LINE_BREAK)
+        elif tag == "hr":
+            self._flush_block()
+            self._emit(["---"], "", "")
+        elif tag == "table":
+            self._flush_block()
+            self._table_depth += 1
+            if self._table is None:
+                self._table = []
+        elif tag == "tr" and self._table is not None and self._table_depth == 1:
+            self._finish_cell()
+            self._table.append([])
+        elif tag in ("td", "th") and self._table is not None and self._table_depth == 1:
+            self._finish_cell()  # the previous cell's end tag is optional
+            if not self._table:
+                self._table.append([])
+            self._cell = len(self._buf)
+        elif tag == "a" and len(self.links) > links_before:
+            self._inline.append(["a", len(self._buf), self.links[-1]])
+        elif tag in self.INLINE_MARKS:
+            self._inline.append([tag, len(self._buf), self.INLINE_MARKS[tag]])
+
+    def end(self, tag: str):
+        ignored = self._inside_ignored
+        super().end(tag)
+        if ignored:
+            return
+        if self._pre:
+            if tag == "pre":
+                self._flush_pre()
+                self._pre -= 1
+                self._pre_lang = ""
+            return
+        if tag in self.HEADINGS:
+            self._flush_block()
+            self._heading = 0
+        elif tag in self.BLOCK_TAGS or tag == "li":
+            self._flush_block()
+        elif tag in ("ul", "ol"):
+            self._flush_block()
+            if self._lists:
+                self._lists.pop()
+            self._marker = None
+        elif tag == "blockquote":
+            self._flush_block()
+            self._quote = max(0, self._quote - 1)
+        elif tag == "table":
+            if self._table_depth == 1:
+                self._finish_cell()
+            self._table_depth = max(0, self._table_depth - 1)
+            if self._table is not None and self._table_depth == 0:
+                self._clear_buf()
+                self._flush_table()
+        elif tag in ("td", "th", "tr") and self._table_depth == 1:
+            self._finish_cell()
+        elif tag == "a" or tag in self.INLINE_MARKS:
+            self._close_inline(tag)
+
+    def _finish_cell(self) -> None:
+        """Close the open table cell, if any, into the current row."""
+        if self._cell is None or self._table is None:
+            return
+        # Inline marks opened in the cell end with it (their buffer indices
+        # would point past the cell once its text is taken out)
+        while self._inline and self._inline[-1][1] >= self._cell:
+            self._close_inline(self._inline[-1][0])
+        text = " ".join(self._collapse("".join(self._buf[self._cell:])))
+        del self._buf[self._cell:]
+        self._cell = None
+        self._table[-1].append(text.replace("|", "\\|"))
+
+    def _close_inline(self, tag: str) -> None:
+        for i in range(len(self._inline) - 1, -1, -1):
+            if self._inline[i][0] == tag:
+                break
+        else:
+            return
+        _, start, extra = self._inline.pop(i)
+        del self._inline[i:]
+        if self._cell is not None and start < self._cell:
+            return  # opened outside the current table cell: drop the mark, keep the text
+        inner = "".join(self._buf[start:])
+        del self._buf[start:]
+        core = " ".join(inner.replace(self.LINE_BREAK, " ").split())
+        if not core:
+            self._buf.append(inner)
+            return
+        lead = " " if inner[:1].isspace() else ""
+        trail = " " if inner[-1:].isspace() else ""
+        if tag == "a":
+            self._buf.append(f"{lead}[{core}]({extra}){trail}")
+        else:
+            self._buf.append(f"{lead}{extra}{core}{extra}{trail}")
+
+    def _heading_start(self, tag: str, attrs) -> None:
+        pass  # sections are started when the heading block is emitted
+
+    def _language(self, attrs) -> str:
+        for cls in (self._attr(attrs, "class") or "").split():
+            for prefix in ("language-", "lang-"):
+                if cls.startswith(prefix):
+                    return cls[len(prefix):]
+        return ""
+
+    def data(self, data: str):
+        if not self._inside_ignored:
+            self._buf.append(data)
+
+    def boundary(self, *_):
+        pass  # comments do not split Markdown blocks
+
+    def close(self):
+        if self._pre:
+            self._flush_pre()
+            self._pre = 0
+        elif self._table is not None:
+            self._finish_cell()
+            self._clear_buf()
+            self._flush_table()
+        self._flush_block()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.text_parts)
+
+
+EXTRACTORS: dict[str, tuple[type, str]] = {
+    "text": (TextExtractor, ".txt"),
+    "markdown": (MarkdownExtractor, ".md"),
+}
+
+
+class DocParser(HTMLParser):
+    """Extracts text content and href links from an HTML page (stdlib backend)."""
+
+    def __init__(self, base_url: str, sink=None, extractor_cls: type = TextExtractor):
+        super().__init__()
+        self.base_url = base_url
+        self.extractor = extractor_cls(base_url, sink)
+        ext = self.extractor
+        self.handle_starttag = ext.start
+        self.handle_endtag = ext.end
+        self.handle_data = ext.data
+        self.handle_comment = ext.boundary
+        self.handle_decl = ext.boundary
+        self.handle_pi = ext.boundary
+        self.unknown_decl = ext.boundary
+
+    def close(self):
+        super().close()
+        self.extractor.close()
+
+    @property
+    def links(self) -> list[str]:
+        return self.extractor.links
+
+    @property
+    def text_parts(self) -> list[str]:
+        return self.extractor.text_parts
+
+    @property
+    def text(self) -> str:
+        return self.extractor.text
+
+
+class LxmlDocParser:
+    """
+    Same interface as DocParser, backed by libxml2's incremental HTML parser.
+
+    lxml calls the target's ``start``/``end``/``data``/``comment`` methods
+    while it parses, so the extractor works unchanged. Only available when
+    lxml is installed.
+    """
+
+    def __init__(self, base_url: str, sink=None, extractor_cls: type = TextExtractor):
+        self.base_url = base_url
+        self.extractor = extractor_cls(base_url, sink)
+        self._parser = etree.HTMLParser(target=_LxmlTarget(self.extractor))
+
+    def feed(self, data: str):
+        if data:
+            self._parser.feed(data)
+
+    def close(self):
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass  # empty document
+        self.extractor.close()
+
+    @property
+    def links(self) -> list[str]:
+        return self.extractor.links
+
+    @property
+    def text_parts(self) -> list[str]:
+        return self.extractor.text_parts
+
+    @property
+    def text(self) -> str:
+        return self.extractor.text
+
+
+class _LxmlTarget:
+    """Adapts lxml's parser-target protocol to TextExtractor."""
+
+    def __init__(self, extractor: TextExtractor):
+        self.end = extractor.end
+        self.data = extractor.data
+        self.comment = extractor.boundary
+        self.pi = extractor.boundary
+        self._start = extractor.start
+
+    def start(self, tag, attrib, nsmap=None):
+        self._start(tag, attrib)
+
+    def close(self):
+        return None
+
+
+PARSER_BACKENDS: dict[str, type] = {"html.parser": DocParser}
+if etree is not None:
+    PARSER_BACKENDS["lxml"] = LxmlDocParser
+
+
+def resolve_backend(name: str = "auto") -> type:
+    """
+    Map a --parser choice to a parser class. ``auto`` is always the stdlib
+    ``html.parser`` backend: lxml repairs malformed markup differently (see
+    bench_parse.py), and scraped_docs output, and with it change detection,
+    must not depend on what happens to be installed. lxml is opt-in.
+    """
+    if name == "auto":
+        return DocParser
+    try:
+        return PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"parser backend {name!r} is not available "
+                         f"(installed: {', '.join(PARSER_BACKENDS)})") from None
+
+
 # ---------------------------------------------------------------------------
 # URL helpers
 # ---------------------------------------------------------------------------
@@ -98,19 +605,665 @@ def normalize_url(url: str) -> str:
     ))
 
 
-def make_filename(url: str, base_path: str) -> str:
+def make_filename(url: str, base_path: str, suffix: str = ".txt") -> str:
     """Derive a safe, readable filename from a URL path."""
     path = urllib.parse.urlparse(url).path
     relative = path.replace(base_path, "", 1).strip("/")
     if not relative:
-        return "index.txt"
-    return relative.replace("/", "_") + ".txt"
+        return "index" + suffix
+    return relative.replace("/", "_") + suffix
+
+
+def remove_partial_files(output_dir: str) -> int:
+    """Delete ``.<name>.<random>.part`` files left by an interrupted crawl; returns how many."""
+    removed = 0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") and entry.name.endswith(".part") and entry.is_file():
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+    return removed
+
+
+# ---------------------------------------------------------------------------
+# Crawl frontier
+# ---------------------------------------------------------------------------
+
+class Frontier:
+    """
+    FIFO crawl frontier with constant-time deduplication.
+
+    Every URL is normalized once, when it is offered. The normalized form
+    goes into ``_seen`` (queued *or* already dequeued), so a URL is never
+    queued twice and never re-queued after it has been crawled.
+    """
+
+    def __init__(self, base_prefix: str, allow=None):
+        self.base_prefix = base_prefix
+        self.allow = allow  # optional url -> bool filter, e.g. RobotsCache.allowed
+        self._queue: deque[str] = deque()
+        self._seen: set[str] = set()
+        self.rejected = 0     # offered but refused: duplicate or out of bounds
+        self.disallowed = 0   # refused by *allow* (robots.txt)
+
+    def enqueue(self, url: str) -> bool:
+        """Queue *url* unless it was seen before, lies outside the boundary or is not allowed."""
+        if not url.startswith(self.base_prefix):
+            self.rejected += 1
+            return False
+        norm = normalize_url(url)
+        if norm in self._seen:
+            self.rejected += 1
+            return False
+        self._seen.add(norm)
+        if self.allow is not None and not self.allow(url):
+            self.disallowed += 1
+            return False
+        self._queue.append(url)
+        return True
+
+    def dequeue(self) -> str:
+        """Pop the oldest queued URL. Raises IndexError when empty."""
+        return self._queue.popleft()
+
+    def seen(self, url: str) -> bool:
+        return normalize_url(url) in self._seen
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def seen_count(self) -> int:
+        return len(self._seen)
+
+    def stats(self) -> dict:
+        return {"pending": self.pending, "seen": self.seen_count, "rejected": self.rejected,
+                "disallowed": self.disallowed}
+
+
+# ---------------------------------------------------------------------------
+# Politeness scheduling
+# ---------------------------------------------------------------------------
+
+class HostThrottle:
+    """Per-host token bucket shared by all crawl workers.
+
+    Each host refills one token every *interval* seconds, up to *burst*
+    tokens. With the default burst of 1 this enforces a minimum gap of
+    *interval* seconds between request starts on the same host, no matter
+    how many workers are waiting. A ``Retry-After`` reported through
+    :meth:`feedback` pauses the host for every worker.
+    """
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = max(0.0, interval)
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}  # host -> (tokens, last refill)
+        self._paused: dict[str, float] = {}                 # host -> monotonic resume time
+        self._starts: dict[str, list] = {}                  # host -> [requests, first, last]
+        self._floors: dict[str, float] = {}                 # host -> robots.txt crawl-delay
+
+    def _interval(self, host: str) -> float:
+        return self.interval
+
+    def _paced_interval(self, host: str) -> float:
+        return max(self._interval(host), self._floors.get(host, 0.0))
+
+    def set_floor(self, host: str, seconds: float) -> None:
+        """Never start requests to *host* less than *seconds* apart (robots.txt Crawl-delay)."""
+        with self._lock:
+            self._floors[host] = max(0.0, seconds)
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to *host* may start. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._paused.get(host, now) - now
+                if wait <= 0:
+                    interval = self._paced_interval(host)
+                    tokens, last = self._buckets.get(host, (float(self.burst), now))
+                    if interval > 0:
+                        tokens = min(float(self.burst), tokens + (now - last) / interval)
+                    else:
+                        tokens = float(self.burst)
+                    if tokens >= 1:
+                        self._buckets[host] = (tokens - 1, now)
+                        starts = self._starts.setdefault(host, [0, now, now])
+                        starts[0] += 1
+                        starts[2] = now
+                        return waited
+                    self._buckets[host] = (tokens, now)
+                    wait = (1 - tokens) * interval
+            time.sleep(wait)
+            waited += wait
+
+    def feedback(self, host: str, status: int | None, latency: float,
+                 retry_after: str | None = None) -> None:
+        """
+        Report how a request to *host* went: its HTTP *status* (None when
+        the connection failed) and seconds to the response headers. A
+        Retry-After pauses the host, for at most ``MAX_RETRY_WAIT`` seconds.
+        """
+        pause = http_pool.parse_retry_after(retry_after)
+        if pause:
+            pause = min(pause, MAX_RETRY_WAIT)
+            with self._lock:
+                resume = time.monotonic() + pause
+                self._paused[host] = max(self._paused.get(host, 0.0), resume)
+
+    def stats(self) -> dict:
+        """Per-host request count and achieved request rate."""
+        with self._lock:
+            result = {}
+            for host, (requests, first, last) in sorted(self._starts.items()):
+                rps = (requests - 1) / (last - first) if last > first else None
+                result[host] = {
+                    "requests": requests,
+                    "requests_per_second": None if rps is None else float(f"{rps:.3f}"),
+                    "interval": float(f"{self._paced_interval(host):.3f}"),
+                }
+                if host in self._floors:
+                    result[host]["crawl_delay"] = self._floors[host]
+            return result
+
+
+class AdaptiveThrottle(HostThrottle):
+    """
+    HostThrottle whose per-host gap follows the server's health (AIMD).
+
+    Every healthy response adds ``INCREASE`` requests/sec to the host's
+    rate; a 429, a 5xx, a connection failure or a latency spike well above
+    the host's moving average halves it. The gap stays between
+    *min_interval* and ``MAX_INTERVAL`` and starts at *interval*.
+    """
+
+    INCREASE = 0.25       # requests/sec added per healthy response
+    DECREASE = 0.5        # rate multiplier on congestion
+    MAX_INTERVAL = 30.0
+    LATENCY_ALPHA = 0.2   # EWMA weight of the newest sample
+
+    def __init__(self, interval: float, min_interval: float = 0.05):
+        super().__init__(interval)
+        self.min_interval = max(0.001, min_interval)
+        self._rate: dict[str, float] = {}      # host -> allowed requests/sec
+        self._latency: dict[str, float] = {}   # host -> EWMA seconds to headers
+        self._backoffs: dict[str, int] = {}
+
+    def _interval(self, host: str) -> float:
+        rate = self._rate.get(host)
+        return 1 / rate if rate else max(self.interval, self.min_interval)
+
+    def feedback(self, host: str, status: int | None, latency: float,
+                 retry_after: str | None = None) -> None:
+        super().feedback(host, status, latency, retry_after)
+        with self._lock:
+            rate = 1 / self._interval(host)
+            average = self._latency.get(host)
+            spike = average is not None and latency > max(2 * average, average + 0.25)
+            if status is None or status == 429 or status >= 500 or spike:
+                rate *= self.DECREASE
+                self._backoffs[host] = self._backoffs.get(host, 0) + 1
+            else:
+                rate += self.INCREASE
+            self._rate[host] = min(1 / self.min_interval, max(1 / self.MAX_INTERVAL, rate))
+            if average is None:
+                self._latency[host] = latency
+            else:
+                self._latency[host] = average + self.LATENCY_ALPHA * (latency - average)
+
+    def stats(self) -> dict:
+        result = super().stats()
+        with self._lock:
+            for host, entry in result.items():
+                entry["backoffs"] = self._backoffs.get(host, 0)
+                latency = self._latency.get(host)
+                entry["latency_ms"] = None if latency is None else round(latency * 1000, 1)
+        return result
+
+
+# Process-wide cap on in-flight requests. Unset for a single-site crawl; in
+# --all-repos mode every site process receives the same semaphore.
+_request_slots = None
+
+
+def _request_slot():
+    return _request_slots if _request_slots is not None else contextlib.nullcontext()
+
+
+# ---------------------------------------------------------------------------
+# Page fetching
+# ---------------------------------------------------------------------------
+
+HTTP_CACHE_FILE = "_http_cache.json"
+CHUNK_SIZE = 16 * 1024
+MAX_RETRY_WAIT = 120  # longer Retry-After hints fail the page instead of stalling a worker
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+
+
+def detect_charset(content_type: str, head: bytes) -> str:
+    """Pick a decoder from the Content-Type header, then a <meta> tag, else UTF-8."""
+    candidates = []
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            candidates.append(value.strip().strip("\"'"))
+    match = _CHARSET_RE.search(head)
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+    for name in candidates:
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+_SLUG_STRIP_RE = re.compile(r"[^\w\- ]")
+
+
+def slugify(title: str) -> str:
+    """GitHub-style heading anchor: lowercase, punctuation dropped, spaces to hyphens."""
+    return _SLUG_STRIP_RE.sub("", title.strip().lower()).replace(" ", "-").strip("-")
+
+
+class HashingSink:
+    """
+    File sink for extracted text that also hashes and fingerprints what it
+    writes, both for the whole page and per heading section.
+    """
+
+    def __init__(self, fout):
+        self._fout = fout
+        self._digest = hashlib.sha256()
+        self.simhash = SimHash()
+        # Text before the first heading is the intro section, anchor ""
+        self._sections: list[dict] = [{"anchor": "", "title": "", "level": 0}]
+        self._section_digest = hashlib.sha256()
+        self._section_bytes = 0
+        self.write_seconds = 0.0   # time spent in the underlying file's write()
+
+    def write(self, text: str) -> None:
+        started = time.perf_counter()
+        self._fout.write(text)
+        self.write_seconds += time.perf_counter() - started
+        data = text.encode("utf-8")
+        self._digest.update(data)
+        self._section_digest.update(data)
+        self._section_bytes += len(data)
+        self.simhash.update(text)
+
+    def _close_section(self) -> None:
+        section = self._sections[-1]
+        section["sha256"] = self._section_digest.hexdigest()[:16] if self._section_bytes else None
+        self._section_digest = hashlib.sha256()
+        self._section_bytes = 0
+
+    def start_section(self, level: int, anchor: str | None) -> None:
+        self._close_section()
+        self._sections.append({"anchor": anchor or "", "title": "", "level": level})
+
+    def name_section(self, title: str) -> None:
+        section = self._sections[-1]
+        section["title"] = title = " ".join(title.split())
+        if not section["anchor"]:
+            section["anchor"] = slugify(title)
+
+    def sections(self) -> list[dict]:
+        """``[{"anchor", "title", "sha256"}]`` in page order, anchors made unique."""
+        self._close_section()
+        seen: dict[str, int] = {}
+        result = []
+        for section in self._sections:
+            if section["sha256"] is None:
+                continue
+            anchor = section["anchor"]
+            if anchor in seen:
+                seen[anchor] += 1
+                anchor = f"{anchor}-{seen[section['anchor']]}"
+            else:
+                seen[anchor] = 0
+            result.append({"anchor": anchor, "title": section["title"], "sha256": section["sha256"]})
+        return result
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def peak_rss_kb() -> int | None:
+    """Process peak resident set size in KiB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def stream_parse(resp, parser, content_type: str, timings: dict | None = None) -> tuple[int, str]:
+    """
+    Feed the response body to *parser* in decoded chunks, never holding the
+    whole page in memory. Returns the raw body size and its SHA-256.
+
+    When *timings* is given, seconds spent reading the body and parsing it
+    are added to its ``download`` and ``parse`` entries.
+    """
+    clock = time.perf_counter
+    digest = hashlib.sha256()
+    size = 0
+    download = parse = 0.0
+    started = clock()
+    chunk = resp.read(CHUNK_SIZE)
+    read_done = clock()
+    download += read_done - started
+    decoder = codecs.getincrementaldecoder(detect_charset(content_type, chunk))(errors="replace")
+    while chunk:
+        size += len(chunk)
+        digest.update(chunk)
+        parser.feed(decoder.decode(chunk))
+        fed = clock()
+        parse += fed - read_done
+        chunk = resp.read(CHUNK_SIZE)
+        read_done = clock()
+        download += read_done - fed
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    parse += clock() - read_done
+    if timings is not None:
+        timings["download"] = timings.get("download", 0.0) + download
+        timings["parse"] = timings.get("parse", 0.0) + parse
+    return size, digest.hexdigest()
+
+
+def _phase(result: dict, name: str, start: float, end: float) -> None:
+    """Add a timed phase (``time.perf_counter`` bounds) to a fetch result."""
+    result["timings"][name] = result["timings"].get(name, 0.0) + (end - start)
+    result["spans"].append((name, start, end))
+
+
+def load_http_cache(output_dir: str) -> dict:
+    """Load the validator cache written by the previous crawl (url -> entry)."""
+    path = os.path.join(output_dir, HTTP_CACHE_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as fin:
+            return json.load(fin)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_http_cache(output_dir: str, cache: dict) -> None:
+    path = os.path.join(output_dir, HTTP_CACHE_FILE)
+    with open(path, "w", encoding="utf-8") as fout:
+        json.dump(dict(sorted(cache.items())), fout, indent=1)
+
+
+def fetch_page(url: str, fpath: str, delay: float, throttle: HostThrottle,
+               cached: dict | None = None, parser_cls: type = DocParser,
+               extractor_cls: type = TextExtractor, queued: float | None = None) -> dict:
+    """
+    Fetch and parse a single page, retrying transient failures.
+
+    Extracted text is streamed into a temporary file next to *fpath*
+    (returned as ``tmp_path``, with the text's hash in ``text_hash``); the
+    caller hands it to the PageStore when the page is committed.
+
+    Runs on a crawl worker thread, so it never touches shared crawl state:
+    console output is buffered in ``log`` and errors are returned in
+    ``errors`` for the caller to merge in crawl order.
+
+    *cached* is this page's entry from the HTTP validator cache. Its ETag
+    and Last-Modified are sent as a conditional GET; on ``304 Not
+    Modified`` the cached links are reused and the page is not parsed
+    again; a 200 whose body hashes the same also reuses the cached entry
+    and leaves the saved file alone.
+
+    Time spent in each phase (see crawl_timing.PHASES) is returned in
+    ``timings`` and, as ``(phase, start, end)`` spans, in ``spans``;
+    *queued* is when the page was handed to the worker pool.
+    """
+    result: dict = {
+        "url": url,
+        "tmp_path": None,   # streamed text awaiting commit
+        "text_hash": None,  # SHA-256 of the extracted text
+        "sections": None,   # per-heading hash index of the extracted text
+        "links": [],
+        "errors": [],
+        "log": [],
+        "bytes": 0,
+        "cache": None,      # "miss", "hit" (same body) or "not_modified" (304)
+        "validators": None,
+        "peak_rss_kb": None,
+        "worker": threading.current_thread().name,
+        "timings": {},
+        "spans": [],
+    }
+    host = urllib.parse.urlparse(url).netloc.lower()
+    started = time.monotonic()
+    if queued is not None:
+        _phase(result, "queue", queued, time.perf_counter())
+
+    headers = {
+        "User-Agent": "DocMaintainer-Crawler/1.0 (+https://github.com/user/DocMaintainer)",
+        "Accept": "text/html,application/xhtml+xml",
+    }
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    retry = http_pool.RetryPolicy(max_attempts=3, backoff=delay)
+    for attempt in range(1, retry.max_attempts + 1):
+        waiting = time.perf_counter()
+        throttle.acquire(host)
+        sent_pc = time.perf_counter()
+        _phase(result, "throttle", waiting, sent_pc)
+        sent = time.monotonic()
+        reported = False
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with _request_slot(), http_pool.urlopen(req, timeout=15) as resp:
+                throttle.feedback(host, resp.status, time.monotonic() - sent)
+                reported = True
+                _request_phases(result, sent_pc, resp.timings)
+                ctype = resp.headers.get("Content-Type", "")
+                if "text/html" not in ctype:
+                    result["log"].append(f"       skip  non-HTML ({ctype})")
+                    break
+                fd, tmp_path = tempfile.mkstemp(
+                    prefix=f".{os.path.basename(fpath)}.", suffix=".part", dir=os.path.dirname(fpath),
+                )
+                body_started = time.perf_counter()
+                body_timings: dict = {}
+                try:
+                    with open(fd, "w", encoding="utf-8") as fout:
+                        fout.write(page_header(url))
+                        sink = HashingSink(fout)
+                        parser = parser_cls(url, sink=sink, extractor_cls=extractor_cls)
+                        size, content_hash = stream_parse(resp, parser, ctype, body_timings)
+                        closing = time.perf_counter()
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+                body_ended = time.perf_counter()
+                # Sink writes happen inside parser.feed(); book them as write, not parse
+                body_timings["parse"] -= sink.write_seconds
+                body_timings["write"] = sink.write_seconds + (body_ended - closing)
+                for phase, seconds in body_timings.items():
+                    result["timings"][phase] = result["timings"].get(phase, 0.0) + seconds
+                result["spans"].append(("body", body_started, body_ended))
+                result["bytes"] += size
+                result["peak_rss_kb"] = peak_rss_kb()
+                fingerprint = sink.simhash.value
+                validators = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "content_hash": content_hash,
+                    "bytes": size,
+                    "simhash": None if fingerprint is None else f"{fingerprint:016x}",
+                }
+
+            if cached and cached.get("content_hash") == content_hash:
+                os.remove(tmp_path)
+                result["cache"] = "hit"
+                result["links"] = cached["links"]
+                result["validators"] = dict(cached, **validators)
+                break
+
+            result["tmp_path"] = tmp_path
+            result["text_hash"] = sink.hexdigest()
+            result["sections"] = sink.sections()
+            result["links"] = parser.links
+            result["cache"] = "miss"
+            result["validators"] = dict(validators, links=parser.links)
+            break  # exit retry loop
+
+        except urllib.error.HTTPError as exc:
+            retry_after = exc.headers.get("Retry-After")
+            throttle.feedback(host, exc.code, time.monotonic() - sent, retry_after)
+            _request_phases(result, sent_pc, getattr(exc, "timings", None))
+            if exc.code == 304 and cached:
+                result["cache"] = "not_modified"
+                result["links"] = cached["links"]
+                result["validators"] = dict(cached)
+                break
+            result["errors"].append({"url": url, "error": f"HTTP {exc.code}", "attempt": attempt})
+            wait = retry.wait(attempt, retry_after) if retry.should_retry(exc.code, attempt) else None
+            if wait is not None and wait > MAX_RETRY_WAIT:
+                result["log"].append(f"       error HTTP {exc.code}  (Retry-After {wait:.0f}s, giving up)")
+                break
+            if wait is not None:
+                result["log"].append(f"       error HTTP {exc.code}  → retry in {wait:.1f}s")
+                backoff = time.perf_counter()
+                time.sleep(wait)
+                _phase(result, "retry", backoff, time.perf_counter())
+            else:
+                result["log"].append(f"       error HTTP {exc.code}")
+                break
+
+        except (urllib.error.URLError, OSError) as exc:
+            if not reported:
+                throttle.feedback(host, None, time.monotonic() - sent)
+            result["errors"].append({"url": url, "error": str(exc), "attempt": attempt})
+            result["log"].append(f"       error {exc}")
+            if attempt < retry.max_attempts:
+                backoff = time.perf_counter()
+                time.sleep(retry.wait(1))
+                _phase(result, "retry", backoff, time.perf_counter())
+            else:
+                break
+
+    result["seconds"] = time.monotonic() - started
+    return result
+
+
+def _request_phases(result: dict, sent: float, timings: dict | None) -> None:
+    """Book http_pool's connect/ttfb split of a request that started at *sent*."""
+    if not timings:
+        return
+    connected = sent + timings["connect"]
+    if timings["connect"]:
+        _phase(result, "connect", sent, connected)
+    _phase(result, "ttfb", connected, connected + timings["ttfb"])
+
+
+def sitemap_skip(url: str, cached: dict, lastmod: str) -> dict:
+    """
+    Result for a page whose sitemap ``lastmod`` predates the last time it
+    was crawled: nothing is fetched and the cached links are reused.
+    """
+    return {
+        "url": url,
+        "tmp_path": None,
+        "text_hash": None,
+        "sections": None,
+        "links": cached["links"],
+        "errors": [],
+        "log": [f"       skip  unchanged since last crawl (lastmod {lastmod})"],
+        "bytes": 0,
+        "cache": "lastmod",
+        "validators": dict(cached),
+        "peak_rss_kb": None,
+        "worker": None,
+        "timings": {},
+        "spans": [],
+        "seconds": 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Checkpointing
+# ---------------------------------------------------------------------------
+
+class CrawlCheckpoint:
+    """
+    Append-only JSON-lines log of committed pages, replayed by ``--resume``.
+
+    The first line identifies the crawl; every following line is one page,
+    written (and flushed) when it is committed, holding what is needed to
+    rebuild the crawl state: the links it added to the frontier, its
+    errors, external links, validators and PageStore entry. Pages that were
+    in flight when the crawl died have no line and are simply fetched again.
+    The file is deleted once a crawl finishes.
+    """
+
+    FILE = "_checkpoint.jsonl"
+
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, self.FILE)
+        self._fout = None
+
+    def load(self, header: dict) -> list[dict]:
+        """Page records of an unfinished crawl matching *header*, or []."""
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as fin:
+            for line in fin:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # torn final line from the interrupted write
+        if not records or records[0] != header:
+            return []
+        return records[1:]
+
+    def open(self, header: dict, resume: bool) -> None:
+        if resume and os.path.exists(self.path):
+            self._fout = open(self.path, "a", encoding="utf-8")
+        else:
+            self._fout = open(self.path, "w", encoding="utf-8")
+            self.record(header)
+
+    def record(self, entry: dict) -> None:
+        self._fout.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._fout.flush()
+
+    def finish(self) -> None:
+        self._fout.close()
+        os.remove(self.path)
 
 
 # ---------------------------------------------------------------------------
 # Crawler
 # ---------------------------------------------------------------------------
 
+# Console verb per PageStore status
+STATUS_VERBS = {
+    "added": "saved",
+    "changed": "saved",
+    "unchanged": "kept ",
+    "duplicate": "dup  ",
+    "near_duplicate": "near ",
+}
+
 def crawl_docs(
     start_url: str,
     base_path: str,
@@ -118,6 +1271,18 @@ def crawl_docs(
     max_pages: int = 100,
     delay: float = 0.5,
     official_domains: list[str] | None = None,
+    concurrency: int = 1,
+    parser: str = "auto",
+    resume: bool = False,
+    use_sitemap: bool = True,
+    check_links: bool = False,
+    near_dup_threshold: int = 6,
+    adaptive: bool = False,
+    min_delay: float = 0.05,
+    extract: str = "text",
+    obey_robots: bool = True,
+    layout: str = "files",
+    trace: bool = False,
 ) -> dict:
     """
     Crawl documentation pages starting from *start_url*, restricting
@@ -127,18 +1292,63 @@ def crawl_docs(
     report classifying every discovered link as official, third-party,
     or dead.
 
+    With *concurrency* > 1, up to that many pages are fetched in parallel
+    while a per-host token bucket keeps request starts at least *delay*
+    seconds apart. Output files are identical to a sequential crawl. With
+    *adaptive*, *delay* is only the starting gap: each host's gap then
+    shrinks towards *min_delay* while it answers quickly and backs off on
+    429/5xx (see ``AdaptiveThrottle``). ``Retry-After`` is always honored.
+
+    *parser* selects the HTML backend (see ``PARSER_BACKENDS``); ``auto``
+    is the stdlib parser, and lxml is used only when asked for.
+    *extract* is ``text`` (plain ``.txt`` files) or ``markdown`` (``.md``
+    files keeping headings, code fences, lists and tables).
+
+    With *use_sitemap*, URLs under the boundary listed in the site's
+    sitemaps are queued right after *start_url*, and a page whose sitemap
+    ``lastmod`` is older than its last crawl is not fetched at all.
+
+    With *check_links*, every external link is checked for liveness (see
+    link_checker.py) and dead ones are added to the link audit.
+
+    Pages whose text is within *near_dup_threshold* SimHash bits of an
+    earlier page are stored as aliases of it, like exact duplicates, and
+    links on duplicate pages are not followed. ``0`` turns this off.
+
+    Every committed page is checkpointed to ``_checkpoint.jsonl``; with
+    *resume*, an interrupted crawl of the same start URL continues from
+    there without re-fetching completed pages.
+
+    With *obey_robots*, the site's robots.txt (cached for a day in
+    ``_robots_cache.json``) keeps disallowed URLs out of the frontier, and
+    a declared ``Crawl-delay`` is the minimum gap between requests to the
+    host, whatever *delay* or the adaptive throttle would allow.
+
+    *layout* ``files`` leaves one file per page in scraped_docs; ``archive``
+    packs them into a single compressed ``_pages.archive`` at the end of
+    the crawl (see page_archive.py).
+
+    Per-page fetch phases (queue wait, throttle, connect, TTFB, download,
+    parse, write) are summarized as histograms under ``phases`` in
+    ``_crawl_meta.json``. With *trace*, every phase span is also written to
+    ``_crawl_trace.json`` in Chrome trace-event format (open it in Perfetto).
+
     Returns a summary dict with stats about the crawl.
     """
+    concurrency = max(1, concurrency)
+    parser_cls = resolve_backend(parser)
+    extractor_cls, suffix = EXTRACTORS[extract]
+    backend = next(name for name, cls in PARSER_BACKENDS.items() if cls is parser_cls)
     parsed_start = urllib.parse.urlparse(start_url)
     base_prefix = f"{parsed_start.scheme}://{parsed_start.netloc}{base_path}"
 
-    queue: list[str] = [start_url]
-    visited: set[str] = set()          # normalized URLs
     visited_original: list[str] = []   # original URLs in visit order
     errors: list[dict] = []
 
     # Link audit tracking: page_url -> list of (href, domain)
     all_external_links: dict[str, list[tuple[str, str]]] = {}
+    # Full link graph: page_url -> every link on the page, internal or external
+    page_links: dict[str, list[str]] = {}
 
     # Resolve output directory relative to the project root
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -146,126 +1356,369 @@ def crawl_docs(
     output_dir = os.path.join(project_root, output_dir_name, "scraped_docs")
     os.makedirs(output_dir, exist_ok=True)
 
+    timers = PhaseTimers()
+    tracer = TraceRecorder() if trace else None
+
+    def main_span(name: str, started: float) -> None:
+        if tracer is not None:
+            tracer.span(name, "main", started, time.perf_counter())
+
+    setup_started = time.perf_counter()
+    robots = RobotsCache(output_dir) if obey_robots else None
+    crawl_delay = robots.crawl_delay(start_url) if robots else None
+    if robots:
+        main_span("robots", setup_started)
+    frontier = Frontier(base_prefix, allow=robots.allowed if robots else None)
+    frontier.enqueue(start_url)
+
+    http_cache = load_http_cache(output_dir)
+    store = PageStore(output_dir, key=normalize_url, layout=layout)
+    near_dups = NearDupIndex(near_dup_threshold) if near_dup_threshold > 0 else None
+    near_dup_distance: dict[str, int] = {}   # url -> SimHash distance, for pages matched this crawl
+    cache_stats = {"hits": 0, "misses": 0, "not_modified": 0, "lastmod_skips": 0, "bytes_saved": 0}
+
     # Header
     print("=" * 60)
     print("  DocMaintainer Web Crawler")
     print("=" * 60)
     print(f"  Start URL   : {start_url}")
     print(f"  Boundary    : {base_prefix}")
-    print(f"  Output      : {output_dir}")
+    print(f"  Output      : {output_dir}" + (" (single-file archive)" if layout == "archive" else ""))
     print(f"  Max pages   : {max_pages}")
-    print(f"  Delay       : {delay}s")
+    print(f"  Delay       : {delay}s" + (f" (adaptive, floor {min_delay}s)" if adaptive else ""))
+    if robots:
+        print("  robots.txt  : " + (f"Crawl-delay {crawl_delay}s" if crawl_delay else "no Crawl-delay")
+              + ("" if frontier.pending else " — start URL is disallowed"))
+    print(f"  Concurrency : {concurrency}")
+    print(f"  Parser      : {backend} ({extract})")
     print("=" * 60)
 
-    start_time = time.time()
+    # Text streamed by pages still in flight when a crawl was interrupted
+    partial = remove_partial_files(output_dir)
+    if partial:
+        print(f"  🧹 Removed {partial} partial file(s) left by an interrupted crawl")
 
-    while queue and len(visited) < max_pages:
-        url = queue.pop(0)
-        norm = normalize_url(url)
+    checkpoint = CrawlCheckpoint(output_dir)
+    header = {"start_url": start_url, "base_path": base_path, "extract": extract}
+    resume_started = time.perf_counter()
+    records = checkpoint.load(header) if resume else []
+    resumable = bool(records)
 
-        if norm in visited:
-            continue
-        if not url.startswith(base_prefix):
-            continue
+    # Seed the frontier from the sitemap. A resumed crawl reuses the seeds
+    # it started with so the replayed queue lines up.
+    sitemap_stats = None
+    if records and "sitemap" in records[0]:
+        seeds = records.pop(0)["sitemap"]
+    elif use_sitemap:
+        sitemap_started = time.perf_counter()
+        seeds, sitemap_stats = sitemap.discover(start_url, base_prefix, robots=robots)
+        main_span("sitemap", sitemap_started)
+        print(f"  Sitemap     : {sitemap_stats['in_boundary']} URLs under the boundary "
+              f"({sitemap_stats['sitemaps']} sitemap file(s))")
+    else:
+        seeds = {}
+    for loc in seeds:
+        frontier.enqueue(loc)
+    lastmods = {normalize_url(loc): lastmod for loc, lastmod in seeds.items() if lastmod}
 
-        page_num = len(visited) + 1
-        remaining = len(queue)
-        print(f"\n[{page_num:>3}/{page_num + remaining}] {url}")
-        visited.add(norm)
+    # Replay an interrupted crawl: re-run its frontier operations in commit
+    # order, which rebuilds the queue exactly as it was.
+    for rec in records:
+        if not frontier.pending or len(visited_original) >= max_pages:
+            break
+        url = frontier.dequeue()
+        if url != rec["url"]:
+            raise RuntimeError(f"checkpoint out of sync at {url} (expected {rec['url']}); "
+                               f"delete {checkpoint.path} to start over")
         visited_original.append(url)
+        errors.extend(rec["errors"])
+        for link in rec["new"]:
+            frontier.enqueue(link)
+        frontier.rejected = rec["rejected"]
+        frontier.disallowed = rec.get("disallowed", frontier.disallowed)
+        if rec["external"]:
+            all_external_links[url] = [tuple(pair) for pair in rec["external"]]
+        if rec["cache"] is not None:
+            page_links[url] = rec["links"]
+        if rec["validators"]:
+            http_cache[normalize_url(url)] = rec["validators"]
+        if rec["cache"] == "miss":
+            cache_stats["misses"] += 1
+        elif rec["cache"] == "hit":
+            cache_stats["hits"] += 1
+        elif rec["cache"] == "not_modified":
+            cache_stats["not_modified"] += 1
+            cache_stats["bytes_saved"] += rec["validators"].get("bytes", 0)
+        elif rec["cache"] == "lastmod":
+            cache_stats["lastmod_skips"] += 1
+            cache_stats["bytes_saved"] += rec["validators"].get("bytes", 0)
+        store.restore(url, rec["entry"], rec["status"], rec.get("sections_changed"))
+        if rec["near_dup"]:
+            near_dup_distance[url] = rec["near_dup"]["distance"]
+        fingerprint = (rec["validators"] or {}).get("simhash")
+        if near_dups is not None and fingerprint and rec["entry"] and not rec["entry"].get("alias_of"):
+            near_dups.add(int(fingerprint, 16), url)
+    resume_seconds = time.perf_counter() - resume_started
+    checkpoint.open(header, resume=resumable)
+    if not resumable:
+        checkpoint.record({"sitemap": seeds})
+    if resume:
+        print(f"  Resumed {len(visited_original)} page(s) from checkpoint in {resume_seconds:.3f}s")
 
-        success = False
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                req = urllib.request.Request(url, headers={
-                    "User-Agent": "DocMaintainer-Crawler/1.0 (+https://github.com/user/DocMaintainer)",
-                    "Accept": "text/html,application/xhtml+xml",
-                })
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    ctype = resp.headers.get("Content-Type", "")
-                    if "text/html" not in ctype:
-                        print(f"       skip  non-HTML ({ctype})")
-                        break
-                    html = resp.read().decode("utf-8", errors="replace")
-
-                parser = DocParser(url)
-                parser.feed(html)
-
-                # Save content
-                fname = make_filename(url, base_path)
-                fpath = os.path.join(output_dir, fname)
-                with open(fpath, "w", encoding="utf-8") as fout:
-                    fout.write(f"URL: {url}\n")
-                    fout.write(f"Scraped: {datetime.now(timezone.utc).isoformat()}\n\n")
-                    fout.write(parser.text)
-
-                # Discover new links & track external links for audit
-                newly_added = []
-                for link in parser.links:
-                    link_norm = normalize_url(link)
-                    link_domain = urllib.parse.urlparse(link).netloc.lower()
-
-                    if link.startswith(base_prefix):
-                        # Internal / boundary link — queue for crawling
-                        if link_norm not in visited:
-                            if not any(normalize_url(q) == link_norm for q in queue):
-                                queue.append(link)
-                                newly_added.append(link)
+    start_time = time.time()
+    throttle = AdaptiveThrottle(delay, min_delay) if adaptive else HostThrottle(delay)
+    if crawl_delay:
+        throttle.set_floor(parsed_start.netloc.lower(), crawl_delay)
+    workers: dict[str, dict] = {}
+    page_rss: dict[str, int] = {}   # url -> process peak RSS (KiB) after parsing it
+
+    # Pages are fetched concurrently but committed strictly in dequeue
+    # order, so the visit order, saved files and discovered links are the
+    # same as a one-at-a-time crawl. A page is dispatched only once it has
+    # been popped from the FIFO queue, and links found by earlier pages are
+    # always appended behind it, so fetching ahead never reorders the BFS.
+    inflight: deque[tuple[int, str, object]] = deque()
+    result: dict = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crawl-worker") as pool:
+            while True:
+                while frontier.pending and len(inflight) < concurrency and len(visited_original) < max_pages:
+                    url = frontier.dequeue()
+                    visited_original.append(url)
+                    fpath = os.path.join(output_dir, make_filename(url, base_path, suffix))
+                    # Only revalidate when the previous crawl's output is on disk
+                    # in the same extraction format
+                    cached = http_cache.get(normalize_url(url))
+                    stored = store.stored_file(url)
+                    if cached and (stored is None or not stored.endswith(suffix)):
+                        cached = None
+                    lastmod = lastmods.get(normalize_url(url))
+                    previous = store.previous.get(normalize_url(url))
+                    # Unparseable lastmods (None) never skip: fetch normally
+                    modified = sitemap.parse_lastmod(lastmod)
+                    if cached and modified is not None and previous and \
+                            modified < datetime.fromisoformat(previous["checked"]):
+                        future = Future()
+                        future.set_result(sitemap_skip(url, cached, lastmod))
                     else:
-                        # External link — record for audit
-                        all_external_links.setdefault(url, []).append((link, link_domain))
-
-                print(f"       saved {fname}  (+{len(newly_added)} links)")
-                success = True
-                break  # exit retry loop
-
-            except urllib.error.HTTPError as exc:
-                errors.append({"url": url, "error": f"HTTP {exc.code}", "attempt": attempt})
-                print(f"       error HTTP {exc.code}", end="")
-                if exc.code in (429, 500, 502, 503, 504) and attempt < max_retries:
-                    wait = delay * (2 ** attempt)
-                    print(f"  → retry in {wait:.1f}s")
-                    time.sleep(wait)
-                else:
-                    print()
+                        future = pool.submit(fetch_page, url, fpath, delay, throttle, cached,
+                                             parser_cls, extractor_cls, time.perf_counter())
+                    inflight.append((len(visited_original), url, future))
+
+                if not inflight:
                     break
 
-            except (urllib.error.URLError, OSError) as exc:
-                errors.append({"url": url, "error": str(exc), "attempt": attempt})
-                print(f"       error {exc}")
-                if attempt < max_retries:
-                    time.sleep(delay * 2)
+                page_num, url, future = inflight.popleft()
+                result = future.result()
+                remaining = frontier.pending + len(inflight)
+                print(f"\n[{page_num:>3}/{page_num + remaining}] {url}")
+                for line in result["log"]:
+                    print(line)
+                errors.extend(result["errors"])
+
+                if result["worker"] is not None:
+                    stats = workers.setdefault(result["worker"], {"pages": 0, "bytes": 0, "busy_seconds": 0.0})
+                    stats["pages"] += 1
+                    stats["bytes"] += result["bytes"]
+                    stats["busy_seconds"] += result["seconds"]
+                if result["peak_rss_kb"] is not None:
+                    page_rss[url] = result["peak_rss_kb"]
+
+                status = None
+                near_dup = None
+                newly_added: list[str] = []
+                if result["cache"] is None:
+                    store.retain(url)
                 else:
-                    break
+                    # Save content (unchanged pages keep the file from the last crawl)
+                    fname = make_filename(url, base_path, suffix)
+                    http_cache[normalize_url(url)] = result["validators"]
+                    fingerprint = result["validators"].get("simhash")
+                    if result["cache"] == "miss":
+                        cache_stats["misses"] += 1
+                        match = near_dups.find(int(fingerprint, 16)) if near_dups and fingerprint else None
+                        committing = time.perf_counter()
+                        status = store.commit(url, fname, result["tmp_path"], result["text_hash"],
+                                              near_dup_of=match[0] if match else None,
+                                              sections=result["sections"])
+                        main_span("commit", committing)
+                        result["timings"]["write"] = (result["timings"].get("write", 0.0)
+                                                      + time.perf_counter() - committing)
+                        if status == "near_duplicate":
+                            near_dup = {"url": url, "of": match[0], "distance": match[1]}
+                            near_dup_distance[url] = match[1]
+                    elif result["cache"] == "hit":
+                        cache_stats["hits"] += 1
+                        status = store.keep(url)
+                    elif result["cache"] == "not_modified":
+                        cache_stats["not_modified"] += 1
+                        cache_stats["bytes_saved"] += result["validators"].get("bytes", 0)
+                        status = store.keep(url)
+                    else:
+                        cache_stats["lastmod_skips"] += 1
+                        cache_stats["bytes_saved"] += result["validators"].get("bytes", 0)
+                        status = store.keep(url)
+
+                    # Duplicates add nothing the original page did not: index the
+                    # originals for near-dup lookups, and only follow their links.
+                    is_alias = bool(store.pages[normalize_url(url)].get("alias_of"))
+                    if near_dups is not None and fingerprint and not is_alias:
+                        near_dups.add(int(fingerprint, 16), url)
+
+                    # Discover new links & track external links for audit
+                    page_links[url] = result["links"]
+                    for link in ([] if is_alias else result["links"]):
+                        if link.startswith(base_prefix):
+                            # Internal / boundary link — queue for crawling
+                            if frontier.enqueue(link):
+                                newly_added.append(link)
+                        else:
+                            link_domain = urllib.parse.urlparse(link).netloc.lower()
+                            # External link — record for audit
+                            all_external_links.setdefault(url, []).append((link, link_domain))
+
+                    sections_changed = store.section_changes.get(url)
+                    print(f"       {STATUS_VERBS[status]} {fname}  (+{len(newly_added)} links)"
+                          + (f"  ~ {near_dup['of']}" if near_dup else "")
+                          + (f"  [{len(sections_changed)} section(s) changed]" if sections_changed else ""))
 
-        time.sleep(delay)
+                timers.add(result["timings"])
+                if tracer is not None:
+                    for name, span_start, span_end in result["spans"]:
+                        tracer.span(name, result["worker"] or "main", span_start, span_end, {"url": url})
+
+                checkpoint.record({
+                    "url": url,
+                    "errors": result["errors"],
+                    "cache": result["cache"],
+                    "validators": result["validators"],
+                    "status": status,
+                    "entry": store.pages.get(normalize_url(url)),
+                    "new": newly_added,
+                    "links": result["links"] if result["cache"] is not None else [],
+                    "near_dup": near_dup,
+                    "sections_changed": store.section_changes.get(url),
+                    "rejected": frontier.rejected,
+                    "disallowed": frontier.disallowed,
+                    "external": all_external_links.get(url, []),
+                })
+
+    except BaseException:
+        # Interrupted: drop the streamed text of pages fetched but not committed
+        # (a committed page's tmp_path has already been moved into place)
+        leftovers = [result] + [f.result() for *_, f in inflight
+                                if f.done() and not f.cancelled() and f.exception() is None]
+        for uncommitted in leftovers:
+            if uncommitted.get("tmp_path"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(uncommitted["tmp_path"])
+        raise
 
     elapsed = time.time() - start_time
 
     # ---- Write outputs ----
 
+    save_http_cache(output_dir, http_cache)
+    if robots:
+        robots.save()
+    finish_started = time.perf_counter()
+    store_stats = store.finish(complete=frontier.pending == 0)
+    main_span("store", finish_started)
+
+    link_results: dict[str, dict] = {}
+    link_stats = None
+    if check_links:
+        external = [href for links_list in all_external_links.values() for href, _ in links_list]
+        print(f"\n  Checking {len(set(external))} external links...")
+        check_started = time.perf_counter()
+        link_results, link_stats = link_checker.check_links(
+            external, cache_dir=output_dir, throttle=HostThrottle(delay), slot=_request_slot,
+        )
+        main_span("link_check", check_started)
+
     # 1. All discovered links
     links_path = os.path.join(output_dir, "_all_links.txt")
     with open(links_path, "w", encoding="utf-8") as fout:
         for u in sorted(visited_original):
             fout.write(f"{u}\n")
 
-    # 2. Crawl metadata / summary
+    # 2. Link graph
+    def graph_key(link: str) -> str:
+        return normalize_url(link) if link.startswith(base_prefix) else link
+
+    page_states: dict[str, str] = {}
+    for url in visited_original:
+        if url in page_links:
+            page_states[graph_key(url)] = "ok"
+    for entry in errors:
+        key = graph_key(entry["url"])
+        if key not in page_states or page_states[key] != "ok":
+            dead = entry["error"] in ("HTTP 404", "HTTP 410")
+            page_states[key] = "dead" if dead else "unreachable"
+    graph_path = os.path.join(output_dir, link_graph.GRAPH_FILE)
+    graph_started = time.perf_counter()
+    graph_stats = link_graph.write_graph(
+        graph_path,
+        graph_key(start_url),
+        page_states,
+        {graph_key(url): [graph_key(link) for link in links] for url, links in page_links.items()},
+        base_prefix,
+        states={href: r["state"] for href, r in link_results.items()},
+    )
+    graph_stats["path"] = graph_path
+    main_span("link_graph", graph_started)
+
+    trace_path = None
+    if tracer is not None:
+        trace_path = os.path.join(output_dir, TRACE_FILE)
+        tracer.write(trace_path)
+
+    # 3. Crawl metadata / summary
+    for stats in workers.values():
+        stats["busy_seconds"] = float(f"{stats['busy_seconds']:.2f}")
+        stats["pages_per_second"] = float(f"{stats['pages'] / elapsed:.3f}") if elapsed > 0 else 0.0
     summary = {
         "start_url": start_url,
         "base_path": base_path,
-        "pages_crawled": len(visited),
+        "pages_crawled": len(visited_original),
         "errors": len(errors),
         "elapsed_seconds": float(f"{elapsed:.2f}"),
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        "concurrency": concurrency,
+        "parser": backend,
+        "extract": extract,
+        "frontier": frontier.stats(),
+        "http_cache": cache_stats,
+        "link_check": link_stats,
+        "link_graph": graph_stats,
+        "near_duplicates": {
+            "threshold": near_dup_threshold,
+            "pages": [
+                {"url": entry["url"], "of": entry["alias_of"], "distance": near_dup_distance.get(entry["url"])}
+                for entry in store.pages.values() if entry.get("near_duplicate")
+            ],
+        },
+        "sitemap": dict(sitemap_stats, seeded=len(seeds)) if sitemap_stats else None,
+        "resumed": {"pages": len(records), "seconds": float(f"{resume_seconds:.3f}")},
+        "store": store_stats,
+        "delta": store.delta,
+        "changed_sections": [
+            dict(change, url=page_url, link=f"{page_url}#{change['anchor']}" if change["anchor"] else page_url)
+            for page_url, changes in store.section_changes.items() for change in changes
+        ],
+        "workers": dict(sorted(workers.items())),
+        "hosts": throttle.stats(),
+        "robots": robots.stats() if robots else None,
+        "peak_rss_kb": page_rss,
+        "phases": timers.to_dict(),
+        "trace": trace_path,
         "error_details": errors,
     }
     meta_path = os.path.join(output_dir, "_crawl_meta.json")
     with open(meta_path, "w", encoding="utf-8") as fout:
         json.dump(summary, fout, indent=2)
 
-    # 3. Link audit report (when --official-domains is provided)
+    # 4. Link audit report (when --official-domains is provided)
     audit_path = None
     if official_domains:
         assert official_domains is not None  # type narrowing for Pyre
@@ -282,10 +1735,18 @@ def crawl_docs(
                 else:
                     third_party_links.setdefault(domain, []).append((href, page_url))
 
-        # Collect dead links from errors
+        # Collect dead links from errors, plus external links that failed the check
         dead_links = [e for e in errors if "HTTP" in e.get("error", "")]
+        dead_external = [r for r in link_results.values() if r["state"] == "dead"]
+        unverified = [r for r in link_results.values() if r["state"] == "unreachable"]
+
+        def redirect_note(href: str) -> str:
+            result = link_results.get(href)
+            if result and result["redirects"]:
+                return f" (redirects → {result['final_url']})"
+            return ""
 
-        with open(audit_path, "w", encoding="utf-8") as fout:
+        with open(audit_path, "w", encoding="utf-8") as fout, link_graph.LinkGraph(graph_path) as graph:
             fout.write("# Link Audit Report\n\n")
             fout.write(f"> Generated: {datetime.now(timezone.utc).isoformat()}\n")
             fout.write(f"> Official domains: {', '.join(sorted(official_set))}\n\n")
@@ -298,7 +1759,7 @@ def crawl_docs(
                     seen = set()
                     for href, source in sorted(official_links[domain]):
                         if href not in seen:
-                            fout.write(f"- {href}\n")
+                            fout.write(f"- {href}{redirect_note(href)}\n")
                             seen.add(href)
                     fout.write("\n")
             else:
@@ -316,7 +1777,7 @@ def crawl_docs(
                     seen = set()
                     for href, source in sorted(third_party_links[domain]):
                         if href not in seen:
-                            fout.write(f"- {href}\n")
+                            fout.write(f"- {href}{redirect_note(href)}\n")
                             fout.write(f"  - Found on: {source}\n")
                             seen.add(href)
                     fout.write("\n")
@@ -325,12 +1786,28 @@ def crawl_docs(
 
             # Dead links
             fout.write("## ❌ Dead Links\n\n")
-            if dead_links:
+            if dead_links or dead_external:
+                sourced = set()
                 for entry in dead_links:
                     fout.write(f"- {entry['url']} — {entry['error']}\n")
+                    if entry["url"] not in sourced:  # once per URL, not per retry
+                        sourced.add(entry["url"])
+                        for source in graph.inbound(graph_key(entry["url"])):
+                            fout.write(f"  - Found on: {source}\n")
+                for result in sorted(dead_external, key=lambda r: r["url"]):
+                    fout.write(f"- {result['url']} — {result['error']}\n")
+                    for source in graph.inbound(result["url"]):
+                        fout.write(f"  - Found on: {source}\n")
                 fout.write("\n")
             else:
                 fout.write("No dead links encountered.\n\n")
+            if unverified:
+                fout.write("### Could not verify\n\n")
+                fout.write("> These did not answer cleanly (blocked, rate-limited or timed out); "
+                           "they will be re-checked on the next crawl.\n\n")
+                for result in sorted(unverified, key=lambda r: r["url"]):
+                    fout.write(f"- {result['url']} — {result['error']}\n")
+                fout.write("\n")
 
         summary["link_audit"] = audit_path
         print(f"  Link audit    : {audit_path}")
@@ -339,15 +1816,148 @@ def crawl_docs(
     print("\n" + "=" * 60)
     print("  Crawl Summary")
     print("=" * 60)
-    print(f"  Pages scraped : {len(visited)}")
+    print(f"  Pages scraped : {len(visited_original)}")
+    print(f"  Frontier      : {frontier.pending} pending, {frontier.seen_count} seen, "
+          f"{frontier.rejected} rejected, {frontier.disallowed} disallowed by robots.txt")
     print(f"  Errors        : {len(errors)}")
+    print(f"  Pages delta   : {store_stats['added']} added, {store_stats['changed']} changed, "
+          f"{store_stats['removed']} removed, {store_stats['unchanged']} unchanged, "
+          f"{store_stats['duplicates']} duplicates, {store_stats['near_duplicates']} near-duplicates")
+    if store.section_changes:
+        print(f"  Sections      : {sum(map(len, store.section_changes.values()))} changed on "
+              f"{len(store.section_changes)} page(s)")
+    print(f"  HTTP cache    : {cache_stats['misses']} fetched, {cache_stats['hits']} unchanged, "
+          f"{cache_stats['not_modified']} not modified, {cache_stats['lastmod_skips']} skipped by sitemap "
+          f"lastmod ({cache_stats['bytes_saved']} bytes saved)")
+    if link_stats:
+        print(f"  External links: {link_stats['ok']} ok, {link_stats['dead']} dead, "
+              f"{link_stats['unreachable']} unverified ({link_stats['cached']} from cache, "
+              f"{link_stats['seconds']}s)")
+    if store_stats["archive"]:
+        archive = store_stats["archive"]
+        print(f"  Archive       : {archive['path']} ({archive['files']} files, {archive['urls']} URLs, "
+              f"{archive['bytes'] / 1024:.0f} KiB {archive['codec']})")
     print(f"  Time elapsed  : {elapsed:.1f}s")
+    phases = summary["phases"]
+    busiest = [p for p in PHASES if phases[p]["count"]]
+    if busiest:
+        print("  Phases p50/p95: " + ", ".join(
+            f"{p} {phases[p]['p50_ms']:.1f}/{phases[p]['p95_ms']:.1f}ms" for p in busiest))
     print(f"  Links index   : {links_path}")
+    print(f"  Link graph    : {graph_path} ({graph_stats['nodes']} URLs, {graph_stats['edges']} links)")
     print(f"  Metadata      : {meta_path}")
+    if trace_path:
+        print(f"  Trace         : {trace_path} (open in https://ui.perfetto.dev)")
     if audit_path:
         print(f"  Link audit    : {audit_path}")
     print("=" * 60)
 
+    checkpoint.finish()
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Multi-site batch crawl
+# ---------------------------------------------------------------------------
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPOS_FILE = os.path.join(PROJECT_ROOT, "repos.json")
+BATCH_SUMMARY_FILE = os.path.join(PROJECT_ROOT, "data", "crawl_summary.json")
+
+
+def _init_site_worker(slots) -> None:
+    global _request_slots
+    _request_slots = slots
+
+
+def crawl_site(repo_name: str, config: dict, options: dict) -> dict:
+    """
+    Crawl one repos.json entry in a worker process. Console output goes to
+    ``<repo>/scraped_docs/_crawl.log`` so parallel sites don't interleave.
+    """
+    output_dir = os.path.join(PROJECT_ROOT, repo_name, "scraped_docs")
+    os.makedirs(output_dir, exist_ok=True)
+    log_path = os.path.join(output_dir, "_crawl.log")
+    started = time.time()
+    try:
+        with open(log_path, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            summary = crawl_docs(
+                config["start_url"],
+                config["base_path"],
+                repo_name,
+                official_domains=config.get("official_domains"),
+                **options,
+            )
+    except Exception as exc:  # one broken site must not sink the batch
+        return {"status": "failed", "error": str(exc), "log": log_path,
+                "elapsed_seconds": float(f"{time.time() - started:.2f}")}
+    return {
+        "status": "ok",
+        "start_url": summary["start_url"],
+        "pages_crawled": summary["pages_crawled"],
+        "errors": summary["errors"],
+        "elapsed_seconds": summary["elapsed_seconds"],
+        "store": summary["store"],
+        "log": log_path,
+    }
+
+
+def crawl_all_repos(
+    repos: dict,
+    max_workers: int | None = None,
+    global_concurrency: int | None = None,
+    **options,
+) -> dict:
+    """
+    Crawl every site in *repos* (the repos.json mapping) concurrently, one
+    site per worker process, and write an aggregate summary to
+    ``data/crawl_summary.json``.
+
+    *options* are passed to :func:`crawl_docs` for every site, so
+    ``concurrency`` and ``delay`` stay per-site (and therefore per-host)
+    limits. *global_concurrency* additionally caps in-flight requests
+    across all sites.
+    """
+    sites = {name: cfg for name, cfg in repos.items() if cfg.get("start_url") and cfg.get("base_path")}
+    max_workers = max_workers or len(sites) or 1
+    slots = multiprocessing.Semaphore(global_concurrency) if global_concurrency else None
+
+    print("=" * 60)
+    print(f"  DocMaintainer Batch Crawl — {len(sites)} site(s), {max_workers} worker(s)")
+    print("=" * 60)
+
+    started = time.time()
+    results: dict[str, dict] = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_site_worker,
+                             initargs=(slots,)) as pool:
+        futures = {pool.submit(crawl_site, name, cfg, options): name for name, cfg in sites.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            result = future.result()
+            results[name] = result
+            if result["status"] == "ok":
+                print(f"  ✅ {name}: {result['pages_crawled']} pages, {result['errors']} errors "
+                      f"in {result['elapsed_seconds']:.1f}s")
+            else:
+                print(f"  ❌ {name}: {result['error']}")
+
+    elapsed = time.time() - started
+    summary = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "elapsed_seconds": float(f"{elapsed:.2f}"),
+        "sum_of_site_seconds": float(f"{sum(r['elapsed_seconds'] for r in results.values()):.2f}"),
+        "max_workers": max_workers,
+        "global_concurrency": global_concurrency,
+        "sites": dict(sorted(results.items())),
+    }
+    os.makedirs(os.path.dirname(BATCH_SUMMARY_FILE), exist_ok=True)
+    with open(BATCH_SUMMARY_FILE, "w", encoding="utf-8") as fout:
+        json.dump(summary, fout, indent=2)
+
+    print("=" * 60)
+    print(f"  Wall time     : {elapsed:.1f}s (sites sum: {summary['sum_of_site_seconds']:.1f}s)")
+    print(f"  Summary       : {BATCH_SUMMARY_FILE}")
+    print("=" * 60)
     return summary
 
 
@@ -361,22 +1971,91 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="See https://github.com/your-org/DocMaintainer for documentation.",
     )
-    ap.add_argument("--start-url", required=True,
+    ap.add_argument("--start-url",
                      help="The URL to begin crawling from.")
-    ap.add_argument("--base-path", required=True,
+    ap.add_argument("--base-path",
                      help="Only follow links whose path starts with this prefix (e.g. /docs/en/).")
-    ap.add_argument("--output-repo", required=True,
+    ap.add_argument("--output-repo",
                      help="Sub-directory under the project root to store scraped output (e.g. ClaudeCodeDocs).")
+    ap.add_argument("--all-repos", action="store_true",
+                     help="Crawl every site in repos.json in parallel (one process per site) "
+                          "instead of a single --start-url.")
+    ap.add_argument("--max-workers", type=int, default=None,
+                     help="With --all-repos: number of site processes (default: one per site).")
+    ap.add_argument("--global-concurrency", type=int, default=None,
+                     help="With --all-repos: cap on in-flight requests across all sites (default: no cap).")
     ap.add_argument("--max-pages", type=int, default=100,
                      help="Maximum number of pages to crawl (default: 100).")
     ap.add_argument("--delay", type=float, default=0.5,
-                     help="Seconds to wait between requests (default: 0.5).")
+                     help="Minimum seconds between requests to the same host (default: 0.5).")
+    ap.add_argument("--adaptive", action="store_true",
+                     help="Adapt the per-host gap to server health: start at --delay, speed up while "
+                          "responses are fast and healthy, back off sharply on 429/5xx.")
+    ap.add_argument("--min-delay", type=float, default=0.05,
+                     help="With --adaptive: smallest gap between requests to one host (default: 0.05).")
+    ap.add_argument("--concurrency", type=int, default=1,
+                     help="Number of pages to fetch in parallel (default: 1, sequential). "
+                          "The --delay spacing per host is still honored.")
+    ap.add_argument("--parser", choices=["auto", "html.parser", "lxml"], default="auto",
+                     help="HTML parser backend (default: auto = html.parser; lxml is faster but "
+                          "repairs malformed markup differently).")
+    ap.add_argument("--no-sitemap", action="store_true",
+                     help="Discover pages by following links only; do not read sitemap.xml.")
+    ap.add_argument("--check-links", action="store_true",
+                     help="Check every external link for liveness and list dead ones in _link_audit.md "
+                          "(results cached for 7 days in _link_check_cache.json).")
+    ap.add_argument("--near-dup-threshold", type=int, default=6,
+                     help="Store pages whose text is within this many SimHash bits (of 64) of an "
+                          "earlier page as duplicates and do not follow their links "
+                          "(default: 6, 0 disables).")
+    ap.add_argument("--extract", choices=list(EXTRACTORS), default="text",
+                     help="Output format: plain text (.txt) or Markdown keeping headings, code "
+                          "blocks and tables (.md). Default: text.")
+    ap.add_argument("--layout", choices=["files", "archive"], default="files",
+                     help="Keep one text file per page (default) or pack all pages into a single "
+                          "compressed scraped_docs/_pages.archive (read it with page_archive.py).")
+    ap.add_argument("--trace", action="store_true",
+                     help="Write scraped_docs/_crawl_trace.json, a Chrome trace of every fetch phase "
+                          "per worker (open in Perfetto or chrome://tracing).")
+    ap.add_argument("--ignore-robots", action="store_true",
+                     help="Do not read robots.txt (disallowed paths are crawled and Crawl-delay "
+                          "is not applied).")
+    ap.add_argument("--resume", action="store_true",
+                     help="Continue an interrupted crawl from scraped_docs/_checkpoint.jsonl "
+                          "without re-fetching completed pages.")
     ap.add_argument("--official-domains", type=str, default=None,
                      help="Comma-separated list of official domains (e.g. docs.example.com,example.com). "
                           "When provided, generates a _link_audit.md report classifying all "
                           "discovered links as official, third-party, or dead.")
 
     args = ap.parse_args()
+    options = {
+        "max_pages": args.max_pages,
+        "delay": args.delay,
+        "concurrency": args.concurrency,
+        "parser": args.parser,
+        "resume": args.resume,
+        "use_sitemap": not args.no_sitemap,
+        "check_links": args.check_links,
+        "near_dup_threshold": args.near_dup_threshold,
+        "adaptive": args.adaptive,
+        "min_delay": args.min_delay,
+        "extract": args.extract,
+        "obey_robots": not args.ignore_robots,
+        "layout": args.layout,
+        "trace": args.trace,
+    }
+
+    if args.all_repos:
+        with open(REPOS_FILE, encoding="utf-8") as fin:
+            repos = json.load(fin)
+        batch = crawl_all_repos(repos, args.max_workers, args.global_concurrency, **options)
+        ok = all(r["status"] == "ok" and r["errors"] == 0 for r in batch["sites"].values())
+        sys.exit(0 if ok else 1)
+
+    if not (args.start_url and args.base_path and args.output_repo):
+        ap.error("--start-url, --base-path and --output-repo are required (or use --all-repos)")
+
     domains = None
     if args.official_domains:
         domains = [d.strip() for d in args.official_domains.split(",") if d.strip()]
@@ -385,9 +2064,8 @@ def main():
         args.start_url,
         args.base_path,
         args.output_repo,
-        args.max_pages,
-        args.delay,
         official_domains=domains,
+        **options,
     )
     sys.exit(0 if summary["errors"] == 0 else 1)
 
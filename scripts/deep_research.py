@@ -29,6 +29,8 @@ import urllib.error
 from datetime import datetime, timezone
 from pathlib import Path
 
+import http_pool
+
 ROOT = Path(__file__).parent.parent
 REPOS_FILE = ROOT / "repos.json"
 REPORTS_DIR = ROOT / "data" / "research_reports"
@@ -41,6 +43,7 @@ MODEL_FALLBACK = ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-2.0-flash-lite
 API_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
 MAX_RETRIES = 3
 RETRY_DELAY = 60  # seconds between retries on 429
+MAX_RETRY_WAIT = RETRY_DELAY  # cap on a server's Retry-After, so a bad header can't stall the run
 INTER_REQUEST_DELAY = 15  # seconds between repos (free tier = 5 RPM)
 
 
@@ -96,6 +99,10 @@ def call_gemini_api(prompt: str, api_key: str, model: str = DEFAULT_MODEL) -> st
         }
     }).encode("utf-8")
 
+    # Constant delay between attempts; the server's Retry-After wins when sent, up to MAX_RETRY_WAIT
+    retry = http_pool.RetryPolicy(max_attempts=MAX_RETRIES, backoff=RETRY_DELAY, multiplier=1.0,
+                                  max_wait=MAX_RETRY_WAIT)
+
     for current_model in models_to_try:
         url = f"{API_BASE}/{current_model}:generateContent?key={api_key}"
 
@@ -108,7 +115,7 @@ def call_gemini_api(prompt: str, api_key: str, model: str = DEFAULT_MODEL) -> st
             )
 
             try:
-                with urllib.request.urlopen(req, timeout=90) as resp:
+                with http_pool.urlopen(req, timeout=90) as resp:
                     data = json.loads(resp.read().decode("utf-8"))
                 candidates = data.get("candidates", [])
                 if candidates:
@@ -119,9 +126,15 @@ def call_gemini_api(prompt: str, api_key: str, model: str = DEFAULT_MODEL) -> st
             except urllib.error.HTTPError as e:
                 body = e.read().decode("utf-8") if e.fp else ""
                 if e.code == 429:
-                    if attempt < MAX_RETRIES:
-                        print(f"  ⏳ Rate limited on {current_model}, retrying in {RETRY_DELAY}s... ({attempt}/{MAX_RETRIES})")
-                        _time.sleep(RETRY_DELAY)
+                    if retry.should_retry(e.code, attempt):
+                        retry_after = e.headers.get("Retry-After")
+                        wait = retry.wait(attempt, retry_after)
+                        requested = http_pool.parse_retry_after(retry_after)
+                        if requested is not None and requested > wait:
+                            print(f"  ⚠️ Retry-After of {requested:.0f}s from {current_model} "
+                                  f"capped at {wait:.0f}s")
+                        print(f"  ⏳ Rate limited on {current_model}, retrying in {wait:.0f}s... ({attempt}/{MAX_RETRIES})")
+                        _time.sleep(wait)
                         continue
                     else:
                         # Exhausted retries for this model, try next one
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+fixture_site.py — Local stand-in doc site for crawler benchmarks.
+
+Serves a deterministic, fully linked documentation site from an in-process
+``ThreadingHTTPServer`` (HTTP/1.1 keep-alive) so crawler performance can be
+measured without touching production doc sites:
+
+  /docs/p<i>        page i, with ``links`` internal and ``external`` external
+                    links, headings and code blocks; every ``large_every``-th
+                    page is padded to about ``large_kb`` KiB
+  /ext/<i>          external link target (served on ``localhost`` so it is a
+                    different host from the ``127.0.0.1`` docs); every tenth
+                    one is a 404
+  /robots.txt       advertises the sitemap
+  /sitemap.xml      every page, with a fixed ``lastmod``
+
+Pages carry an ETag and answer conditional GETs with 304, like the real
+sites. Latency, 429s (with ``Retry-After``) and 5xx responses can be
+injected; they are drawn from a seeded RNG, so runs are comparable.
+
+The server counts accepted connections, requests by status and bytes sent
+(see :meth:`FixtureSite.stats`).
+
+Usage:
+    python scripts/fixture_site.py --pages 500 --latency-ms 20   # serve until Ctrl-C
+
+    from fixture_site import FixtureSite
+    with FixtureSite(pages=200, rate_429=0.02) as site:
+        crawler.crawl_docs(site.start_url, "/docs/", out_dir, delay=0)
+        print(site.stats())
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LASTMOD = "2025-01-01T00:00:00+00:00"
+
+
+class FixtureSite(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        pages: int = 100,
+        links: int = 3,
+        external: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        retry_after: int = 1,
+        large_every: int = 0,
+        large_kb: int = 256,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        super().__init__(("127.0.0.1", port), _FixtureHandler)
+        self.pages = pages
+        self.links = links
+        self.external = external
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.large_every = large_every
+        self.large_kb = large_kb
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.reset_stats()
+
+    # -- lifecycle ----------------------------------------------------------
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def start_url(self) -> str:
+        return f"{self.base_url}/docs/p0"
+
+    def start(self) -> "FixtureSite":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "FixtureSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- accounting ---------------------------------------------------------
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+            self.bytes_sent = 0
+            self.statuses: Counter = Counter()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "requests": self.requests,
+                "bytes_sent": self.bytes_sent,
+                "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            }
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def _record(self, status: int, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += size
+            self.statuses[status] += 1
+
+    def _draw(self) -> tuple[float, str | None]:
+        """Latency in seconds and the fault to inject (``"429"``, ``"5xx"`` or None)."""
+        with self._lock:
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+        if roll < self.rate_429:
+            return delay, "429"
+        if roll < self.rate_429 + self.rate_5xx:
+            return delay, "5xx"
+        return delay, None
+
+    # -- content ------------------------------------------------------------
+
+    def page(self, i: int) -> bytes:
+        n = self.pages
+        rng = random.Random(self.seed * 1_000_003 + i)
+        links = "".join(
+            f'<li><a href="/docs/p{target}">Page {target}</a></li>'
+            for target in [(i + 1) % n] + [rng.randrange(n) for _ in range(max(0, self.links - 1))]
+        )
+        external = "".join(
+            f'<li><a href="http://localhost:{self.port}/ext/{rng.randrange(self.pages * 2)}">ref</a></li>'
+            for _ in range(self.external)
+        )
+        sections = [
+            f'<h2 id="s{k}">Section {k}</h2>'
+            f"<p>Page {i} section {k} explains <code>--flag-{k}</code> and related options.</p>"
+            f"<pre><code>$ tool run --page {i} --section {k}</code></pre>"
+            for k in range(3)
+        ]
+        body = (
+            f"<html><head><title>Page {i}</title><script>var page = {i};</script></head><body>"
+            f"<nav><ul>{links}</ul></nav><main><h1>Page {i}</h1>{''.join(sections)}"
+            f"<ul>{external}</ul></main></body></html>"
+        )
+        if self.large_every and i % self.large_every == 0:
+            filler = f"<p>Filler paragraph for page {i} with enough words to be realistic text.</p>"
+            body = body.replace("</main>", filler * (self.large_kb * 1024 // len(filler)) + "</main>")
+        return body.encode()
+
+    def sitemap(self) -> bytes:
+        entries = "".join(
+            f"<url><loc>{self.base_url}/docs/p{i}</loc><lastmod>{LASTMOD}</lastmod></url>"
+            for i in range(self.pages)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+        ).encode()
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def _send(self, status: int, body: bytes = b"", ctype: str = "text/html; charset=utf-8",
+              headers: dict | None = None, head: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+        self.server._record(status, 0 if head else len(body))
+
+    def _route(self, head: bool = False) -> None:
+        site = self.server
+        path = self.path.split("?", 1)[0]
+        if path == "/robots.txt":
+            return self._send(200, f"User-agent: *\nSitemap: {site.base_url}/sitemap.xml\n".encode(),
+                              "text/plain", head=head)
+        if path == "/sitemap.xml":
+            return self._send(200, site.sitemap(), "application/xml", head=head)
+
+        delay, fault = site._draw()
+        if delay:
+            time.sleep(delay)
+        if fault == "429":
+            return self._send(429, b"slow down", "text/plain",
+                              {"Retry-After": str(site.retry_after)}, head=head)
+        if fault == "5xx":
+            return self._send(503, b"unavailable", "text/plain", head=head)
+
+        kind, _, index = path.strip("/").partition("/")
+        try:
+            i = int(index.lstrip("p"))
+        except ValueError:
+            return self._send(404, b"not found", "text/plain", head=head)
+        if kind == "ext":
+            status = 404 if i % 10 == 0 else 200
+            return self._send(status, b"<html><body>external</body></html>", head=head)
+        if kind != "docs" or not 0 <= i < site.pages:
+            return self._send(404, b"not found", "text/plain", head=head)
+
+        body = site.page(i)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag}, head=True)
+        self._send(200, body, headers={"ETag": etag}, head=head)
+
+    def do_GET(self):
+        self._route()
+
+    def do_HEAD(self):
+        self._route(head=True)
+
+    def log_message(self, *args):
+        pass
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Serve a local fixture doc site for crawler benchmarks.")
+    ap.add_argument("--pages", type=int, default=100, help="Number of doc pages (default: 100).")
+    ap.add_argument("--links", type=int, default=3, help="Internal links per page (default: 3).")
+    ap.add_argument("--external", type=int, default=0, help="External links per page (default: 0).")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request.")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random latency, 0..N ms.")
+    ap.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered 429.")
+    ap.add_argument("--rate-5xx", type=float, default=0.0, help="Fraction of requests answered 503.")
+    ap.add_argument("--large-every", type=int, default=0, help="Pad every Nth page (0 = never).")
+    ap.add_argument("--large-kb", type=int, default=256, help="Size of padded pages in KiB.")
+    ap.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000).")
+    args = ap.parse_args()
+
+    site = FixtureSite(
+        pages=args.pages, links=args.links, external=args.external,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        large_every=args.large_every, large_kb=args.large_kb, port=args.port,
+    )
+    print(f"🌐 Fixture site: {site.start_url}  ({args.pages} pages)")
+    try:
+        site.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server_close()
+        print(f"\n{site.stats()}")
+
+
+if __name__ == "__main__":
+    main()
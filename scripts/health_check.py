@@ -6,22 +6,48 @@ Checks:
   - Stub/empty files (< 15 lines)
   - Missing standard docs (getting-started, features, commands, changelog, official-links)
   - VERSION.md freshness
-  - Internal link validation
+  - Internal link validation, including ``#anchor`` fragments against the
+    target doc's headings (GitHub slugs) and ``<a name/id>`` anchors
   - Cross-repo doc count comparison
 
+Files are scanned by a process pool (``--jobs``) and the results merged
+in file order, so the report is the same whatever the job count.
+
+Per-file results (line count, stub and marker findings, link targets,
+heading anchors) are kept in ``.health_cache.json`` at the repo root. A
+file whose size and mtime are unchanged is not read again; one whose mtime
+moved is re-hashed and only re-scanned if its content actually changed.
+Link targets are resolved on every run, since that depends on other files,
+against a single listing of each repo's docs/ tree.
+
 Usage:
     python scripts/health_check.py                  # check all repos
     python scripts/health_check.py --repo GeminiDocs # single repo
+    python scripts/health_check.py --jobs 8          # scan files in 8 processes
+    python scripts/health_check.py --no-cache        # re-scan every file
+
+    import health_check
+    report = health_check.run(["GeminiDocs"])   # same checks and cache, in-process
+    report.failing()                            # {repo: [issue, ...]} for repos with issues
 """
 
 import argparse
+import hashlib
 import json
+import os
+import posixpath
 import re
 import sys
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
 REPOS_FILE = ROOT / "repos.json"
+CACHE_FILE = ROOT / ".health_cache.json"
+# Bump when the per-file checks change, so stale cached findings are dropped
+CACHE_VERSION = 3
 
 STANDARD_DOCS = [
     "getting-started.md",
@@ -32,7 +58,16 @@ STANDARD_DOCS = [
 ]
 
 STUB_MARKERS = ["pending", "todo", "placeholder", "stub", "coming soon", "tbd"]
+# Markers that are flagged even in files with real content (> 30 lines)
+STRONG_MARKERS = ("placeholder", "stub", "coming soon", "tbd")
 MIN_LINES = 15
+LINK_RE = re.compile(r'\[.*?\]\(\./([^)]+)\)')
+_SLUG_STRIP_RE = re.compile(r"[^\w\- ]")
+_INLINE_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_CLOSING_HASHES_RE = re.compile(r"[ \t]+#+$")
+# Below this many files in total, a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
 
 
 def load_repos() -> dict:
@@ -40,26 +75,299 @@ def load_repos() -> dict:
         return json.load(f)
 
 
-def check_repo(repo_name: str) -> dict:
-    """Run all health checks on a single repo."""
-    repo_dir = ROOT / repo_name
-    docs_dir = repo_dir / "docs"
+# ---------------------------------------------------------------------------
+# Per-file scan (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def _build_scanner() -> re.Pattern:
+    """
+    One alternation over the lowercased text that finds every stub marker,
+    internal link, ATX heading, code fence and ``<a name/id>`` anchor. Each
+    branch begins with a literal character, so ``re`` can skip ahead to
+    candidate positions instead of trying the pattern at every offset.
+    Markers sharing a first letter are grouped (``p(?:ending|laceholder)``),
+    and word boundaries and line starts are written as lookbehinds after the
+    first character. Links and heading text are matched inside lookaheads so
+    that markers and links within them are still seen.
+    """
+    branches = [
+        r"\[(?=(?P<link>.*?\]\(\./(?P<target>[^)]+)\)))",
+        r"#(?<![^\n].)(?=(?P<heading>#{0,5}(?:[ \t][^\n]*)?)(?=\n|\Z))",
+        r"`(?<![^\n].)(?P<backticks>``)",
+        r"~(?<![^\n].)(?P<tildes>~~)",
+        r"""<(?=a\s[^>]*?\b(?:name|id)\s*=\s*["'](?P<html_anchor>[^"']+)["'])""",
+    ]
+    markers = sorted(enumerate(STUB_MARKERS), key=lambda item: item[1][0])
+    for first, group in groupby(markers, key=lambda item: item[1][0]):
+        tails = "|".join(f"(?P<m{i}>{re.escape(marker[1:])})" for i, marker in group)
+        branches.append(rf"{re.escape(first)}(?<!\w.)(?:{tails})(?!\w)")
+    return re.compile("|".join(branches))
+
+
+SCANNER = _build_scanner()
+
+
+def heading_slug(title: str) -> str:
+    """GitHub's heading anchor: rendered text lowercased, punctuation dropped, spaces to hyphens."""
+    if "[" in title:
+        title = _INLINE_LINK_RE.sub(r"\1", title)
+    if "<" in title:
+        title = _HTML_TAG_RE.sub("", title)
+    return _SLUG_STRIP_RE.sub("", title.strip().lower()).replace(" ", "-")
+
+
+def _heading_title(raw: str) -> str:
+    """ATX heading text without its opening and optional closing ``#`` run."""
+    title = raw.lstrip("#").strip()
+    if not title.endswith("#"):
+        return title
+    if title.strip("#") == "":
+        return ""
+    return _CLOSING_HASHES_RE.sub("", title)
+
+
+def scan_text(content: str) -> dict:
+    """
+    Line count, stub markers present (in ``STUB_MARKERS`` order), internal
+    link targets (``#fragment`` kept) and the anchors the document defines,
+    from a single regex pass.
+
+    Markers and links are the same as matching ``\\b<marker>\\b`` against
+    ``content.lower()`` once per marker, plus ``LINK_RE.findall(content)``;
+    overlapping link matches are skipped the way ``findall`` skips them.
+    Anchors are GitHub heading slugs (duplicates numbered ``-1``, ``-2``, ...;
+    headings inside fenced code ignored) plus ``<a name=...>``/``<a id=...>``.
+    """
+    lowered = content.lower()
+    found: set[str] = set()
+    links: list[str] = []
+    link_end = 0
+    slugs: list[str] = []
+    html_anchors: list[str] = []
+    fence = None
+    for match in SCANNER.finditer(lowered):
+        group = match.lastgroup
+        if group == "link":
+            if match.start() >= link_end:
+                start, end = match.span("target")
+                links.append(content[start:end])
+                link_end = match.end("link")
+        elif group == "heading":
+            if fence is None:
+                slug = heading_slug(_heading_title(match.group("heading")))
+                if slug:
+                    slugs.append(slug)
+        elif group in ("backticks", "tildes"):
+            fence = group if fence is None else None if fence == group else fence
+        elif group == "html_anchor":
+            html_anchors.append(match.group("html_anchor"))
+        else:
+            found.add(group)
+    if len(lowered) != len(content):
+        # lower() changed some character's length, so spans don't map back
+        links = LINK_RE.findall(content)
+
+    anchors: list[str] = []
+    seen: dict[str, int] = {}
+    for slug in slugs:
+        if slug in seen:
+            seen[slug] += 1
+            anchors.append(f"{slug}-{seen[slug]}")
+        else:
+            seen[slug] = 0
+            anchors.append(slug)
+    return {
+        "line_count": content.strip().count("\n") + 1,
+        "markers": [marker for i, marker in enumerate(STUB_MARKERS) if f"m{i}" in found],
+        "links": links,
+        "anchors": anchors + html_anchors,
+    }
+
+
+def scan_file(path: str, known_sha256: str | None = None) -> dict:
+    """
+    Scan one docs/*.md file: line count, stub size, placeholder markers, the
+    internal link targets it references and the anchors it defines. Runs in a worker process, so it
+    only takes and returns plain data.
+
+    If the content still hashes to *known_sha256*, the scan is skipped and
+    only ``unchanged`` and the file's identity are returned.
+    """
+    md_file = Path(path)
+    name = md_file.name
+    st = md_file.stat()
+    data = md_file.read_bytes()
+    identity = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": hashlib.sha256(data).hexdigest()}
+    if identity["sha256"] == known_sha256:
+        return {**identity, "unchanged": True}
+
     issues: list[str] = []
     warnings: list[str] = []
-    stats: dict = {}
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        content = data.decode("utf-8", errors="replace")
+    content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    scan = scan_text(content)
+    line_count = scan["line_count"]
+
+    # Stub detection
+    if line_count < MIN_LINES:
+        issues.append(f"🔴 Stub file: docs/{name} ({line_count} lines)")
+
+    # Marker detection — word boundaries avoid false positives
+    # (e.g., "Todos" tool name, "Pending child-thread" feature name)
+    for marker in scan["markers"]:
+        # Skip weak markers in files with real content (> 30 lines), where
+        # they are more likely part of a feature description
+        if line_count < 30 or marker in STRONG_MARKERS:
+            warnings.append(f"⚠️ Placeholder marker '{marker}' in docs/{name}")
+            break
+
+    # Internal links and anchors; targets are resolved at merge time
+    return {**identity, "line_count": line_count, "issues": issues, "warnings": warnings,
+            "links": scan["links"], "anchors": scan["anchors"]}
+
+
+def _scan_task(task: tuple[str, str | None]) -> dict:
+    return scan_file(*task)
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+class ResultCache:
+    """
+    Per-file scan results keyed by path relative to ROOT, each stored with
+    the size, mtime and content hash it was computed from.
+    """
+
+    def __init__(self, path: Path | None = CACHE_FILE):
+        self.path = path
+        self.hits = 0       # size + mtime matched: file not read
+        self.rehashed = 0   # mtime moved but content hash matched: read, not scanned
+        self.misses = 0     # new or changed: scanned
+        self._entries: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as fin:
+                data = json.load(fin)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        data = {"version": CACHE_VERSION, "files": dict(sorted(self._entries.items()))}
+        with open(self.path, "w", encoding="utf-8") as fout:
+            json.dump(data, fout, indent=1, ensure_ascii=False)
+
+    def get(self, key: str) -> dict | None:
+        return self._entries.get(key)
+
+    def put(self, key: str, entry: dict) -> None:
+        self._entries[key] = entry
+
+    def prune(self, prefix: str, keep: set[str]) -> None:
+        """Forget entries under *prefix* (one repo's docs/) that are not in *keep*."""
+        for key in [k for k in self._entries if k.startswith(prefix) and k not in keep]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.rehashed + self.misses
+        reused = self.hits + self.rehashed
+        return {
+            "files": total,
+            "hits": self.hits,
+            "rehashed": self.rehashed,
+            "misses": self.misses,
+            "hit_rate": round(reused / total, 3) if total else None,
+        }
+
+
+def _cache_key(md_file: Path) -> str:
+    return md_file.relative_to(ROOT).as_posix()
+
+
+# ---------------------------------------------------------------------------
+# Repo checks
+# ---------------------------------------------------------------------------
+
+def _plan_repo(repo_name: str) -> tuple[dict | None, list[Path]]:
+    """Repo-level preconditions: an early result if the repo can't be scanned, else its docs."""
+    repo_dir = ROOT / repo_name
+    docs_dir = repo_dir / "docs"
 
     # Check repo exists
     if not repo_dir.exists():
-        return {"issues": [f"❌ Repository directory not found: {repo_dir}"], "warnings": [], "stats": {}}
+        return {"issues": [f"❌ Repository directory not found: {repo_dir}"], "warnings": [], "stats": {}}, []
 
     # Check docs/ exists
     if not docs_dir.exists():
-        return {"issues": [f"❌ No docs/ directory"], "warnings": [], "stats": {}}
+        return {"issues": [f"❌ No docs/ directory"], "warnings": [], "stats": {}}, []
 
     # Get all md files
-    md_files = sorted(docs_dir.glob("*.md"))
-    stats["doc_count"] = len(md_files)
-    stats["total_lines"] = 0
+    return None, sorted(docs_dir.glob("*.md"))
+
+
+def snapshot_tree(docs_dir: Path) -> set[str]:
+    """
+    Every path under *docs_dir* (files and directories, relative, POSIX
+    separators, ``"."`` for the directory itself) from one ``os.scandir``
+    walk, so link targets are set lookups instead of a stat per link.
+    Symlinks count only if they resolve, as with ``Path.exists``; a
+    symlinked directory is listed under its own path even when its target
+    is walked too, and is only cut off when it loops back to an ancestor.
+    """
+    paths = {"."}
+    stack = [("", str(docs_dir), frozenset())]
+    while stack:
+        prefix, directory, ancestors = stack.pop()
+        real = os.path.realpath(directory)
+        if real in ancestors:
+            continue
+        ancestors = ancestors | {real}
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_symlink() and not os.path.exists(entry.path):
+                    continue
+                rel = prefix + entry.name
+                paths.add(rel)
+                if entry.is_dir():
+                    stack.append((rel + "/", entry.path, ancestors))
+    return paths
+
+
+def _target_exists(docs_dir: Path, snapshot: set[str], link_path: str) -> bool:
+    target = posixpath.normpath(link_path)
+    if target == ".." or target.startswith(("../", "/")):
+        # Outside docs/, so not in the snapshot
+        return (docs_dir / link_path).exists()
+    # A miss is confirmed on disk: paths through a symlink loop aren't in the snapshot
+    return target in snapshot or (docs_dir / link_path).exists()
+
+
+def _merge_repo(repo_name: str, md_files: list[Path], file_results: list[dict]) -> dict:
+    """Combine per-file results (in *md_files* order) with link and repo-level checks."""
+    repo_dir = ROOT / repo_name
+    docs_dir = repo_dir / "docs"
+    snapshot = snapshot_tree(docs_dir)
+    anchors = {md_file.name: set(result["anchors"]) for md_file, result in zip(md_files, file_results)}
+    issues: list[str] = []
+    warnings: list[str] = []
+    stats: dict = {"doc_count": len(md_files), "total_lines": 0}
 
     # Check for standard docs
     existing = {f.name for f in md_files}
@@ -67,41 +375,22 @@ def check_repo(repo_name: str) -> dict:
         if std not in existing:
             warnings.append(f"⚠️ Missing standard doc: docs/{std}")
 
-    # Check each file
-    for md_file in md_files:
-        try:
-            content = md_file.read_text(encoding="utf-8")
-        except Exception:
-            content = md_file.read_text(encoding="utf-8", errors="replace")
-
-        lines = content.strip().split("\n")
-        line_count = len(lines)
-        stats["total_lines"] += line_count
-
-        # Stub detection
-        if line_count < MIN_LINES:
-            issues.append(f"🔴 Stub file: docs/{md_file.name} ({line_count} lines)")
-
-        # Marker detection — use word boundaries to avoid false positives
-        # (e.g., "Todos" tool name, "Pending child-thread" feature name)
-        content_lower = content.lower()
-        for marker in STUB_MARKERS:
-            pattern = r'\b' + re.escape(marker) + r'\b'
-            # Only flag if the marker appears as a standalone phrase, not as part of
-            # a feature name or tool description
-            if re.search(pattern, content_lower):
-                # Extra check: skip if the file has real content (> 30 lines)
-                # and the marker only appears in a feature description context
-                if line_count < 30 or marker in ("placeholder", "stub", "coming soon", "tbd"):
-                    warnings.append(f"⚠️ Placeholder marker '{marker}' in docs/{md_file.name}")
-                    break
+    for md_file, result in zip(md_files, file_results):
+        stats["total_lines"] += result["line_count"]
+        issues.extend(result["issues"])
+        warnings.extend(result["warnings"])
 
         # Internal link validation
-        links = re.findall(r'\[.*?\]\(\./([^)]+)\)', content)
-        for link in links:
-            link_path = link.split("#")[0]  # strip anchors
-            if not (docs_dir / link_path).exists():
+        for link in result["links"]:
+            link_path, _, fragment = link.partition("#")
+            if not _target_exists(docs_dir, snapshot, link_path):
                 issues.append(f"🔴 Broken link: docs/{md_file.name} → ./{link_path}")
+                continue
+            # Anchors are indexed for the docs/*.md files scanned here
+            target_anchors = anchors.get(posixpath.normpath(link_path))
+            if fragment and target_anchors is not None \
+                    and urllib.parse.unquote(fragment).lower() not in target_anchors:
+                issues.append(f"🔴 Broken anchor: docs/{md_file.name} → ./{link_path}#{fragment}")
 
     # Check VERSION.md
     version_file = repo_dir / "VERSION.md"
@@ -120,24 +409,144 @@ def check_repo(repo_name: str) -> dict:
     return {"issues": issues, "warnings": warnings, "stats": stats}
 
 
+def resolve_jobs(jobs: int | None, file_count: int) -> int:
+    """``None`` means auto: one process per CPU, but only for trees big enough to benefit."""
+    if jobs is None:
+        return (os.cpu_count() or 1) if file_count >= PARALLEL_MIN_FILES else 1
+    return max(1, jobs)
+
+
+def check_repos(repo_names, jobs: int | None = None, cache: ResultCache | None = None) -> dict[str, dict]:
+    """
+    Run all health checks on several repos. Every docs file that *cache*
+    can't vouch for is one scan task; with more than one job they run on a
+    process pool. Results are merged back in repo and file order.
+    """
+    plans: dict[str, tuple[dict | None, list[Path]]] = {name: _plan_repo(name) for name in repo_names}
+    md_files = [md_file for _, files in plans.values() for md_file in files]
+
+    # Files whose size and mtime match their cache entry are taken as is
+    file_results: list[dict | None] = [None] * len(md_files)
+    pending: list[int] = []
+    tasks: list[tuple[str, str | None]] = []
+    for i, md_file in enumerate(md_files):
+        entry = cache.get(_cache_key(md_file)) if cache else None
+        if entry:
+            st = md_file.stat()
+            if (st.st_size, st.st_mtime_ns) == (entry["size"], entry["mtime_ns"]):
+                file_results[i] = entry
+                cache.hits += 1
+                continue
+        pending.append(i)
+        tasks.append((str(md_file), entry["sha256"] if entry else None))
+
+    jobs = resolve_jobs(jobs, len(tasks))
+    if jobs > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            scanned = list(pool.map(_scan_task, tasks, chunksize=chunksize))
+    else:
+        scanned = [_scan_task(task) for task in tasks]
+
+    for i, result in zip(pending, scanned):
+        if result.pop("unchanged", False):
+            # Touched but not edited: keep the findings, refresh the identity
+            result = {**cache.get(_cache_key(md_files[i])), **result}
+            cache.rehashed += 1
+        elif cache:
+            cache.misses += 1
+        file_results[i] = result
+        if cache:
+            cache.put(_cache_key(md_files[i]), result)
+
+    results: dict[str, dict] = {}
+    offset = 0
+    for repo_name, (early, files) in plans.items():
+        if early is not None:
+            results[repo_name] = early
+        else:
+            results[repo_name] = _merge_repo(repo_name, files, file_results[offset:offset + len(files)])
+            offset += len(files)
+        if cache:
+            cache.prune(f"{repo_name}/docs/", {_cache_key(f) for f in files})
+    return results
+
+
+def check_repo(repo_name: str, jobs: int | None = 1, cache: ResultCache | None = None) -> dict:
+    """Run all health checks on a single repo."""
+    return check_repos([repo_name], jobs=jobs, cache=cache)[repo_name]
+
+
+class HealthReport:
+    """
+    Outcome of one health check run: per-repo ``{"issues", "warnings",
+    "stats"}`` in the order the repos were checked, plus cache statistics
+    (``None`` when the cache was off).
+    """
+
+    def __init__(self, repos: dict[str, dict], cache: dict | None = None):
+        self.repos = repos
+        self.cache = cache
+
+    def issues(self, repo_name: str) -> list[str]:
+        return self.repos[repo_name]["issues"]
+
+    def warnings(self, repo_name: str) -> list[str]:
+        return self.repos[repo_name]["warnings"]
+
+    @property
+    def issue_count(self) -> int:
+        return sum(len(result["issues"]) for result in self.repos.values())
+
+    @property
+    def warning_count(self) -> int:
+        return sum(len(result["warnings"]) for result in self.repos.values())
+
+    @property
+    def ok(self) -> bool:
+        """True when no repo has issues (warnings don't count)."""
+        return self.issue_count == 0
+
+    def failing(self) -> dict[str, list[str]]:
+        """``{repo_name: issues}`` for the repos that have any."""
+        return {name: result["issues"] for name, result in self.repos.items() if result["issues"]}
+
+    def to_dict(self) -> dict[str, dict]:
+        """The ``--json`` output."""
+        return self.repos
+
+
+def run(repos=None, jobs: int | None = None, use_cache: bool = True) -> HealthReport:
+    """
+    Check *repos* (names; default: every repo in repos.json) and return the
+    report. Reads and updates the same result cache as the command line.
+    """
+    names = list(load_repos() if repos is None else repos)
+    cache = ResultCache() if use_cache else None
+    results = check_repos(names, jobs=jobs, cache=cache)
+    if cache:
+        cache.save()
+    return HealthReport(results, cache.stats() if cache else None)
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Health check all doc repos.")
     ap.add_argument("--repo", type=str, help="Check a single repo.")
     ap.add_argument("--json", action="store_true", help="Output as JSON.")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="Worker processes for scanning files (default: one per CPU on large trees, "
+                         "1 = no pool).")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Re-scan every file; don't read or write {CACHE_FILE.name}.")
     args = ap.parse_args()
 
     repos = load_repos()
     targets = {args.repo: repos[args.repo]} if args.repo else repos
 
-    all_results = {}
-    total_issues = 0
-    total_warnings = 0
-
-    for repo_name in targets:
-        result = check_repo(repo_name)
-        all_results[repo_name] = result
-        total_issues += len(result["issues"])
-        total_warnings += len(result["warnings"])
+    report = run(targets, jobs=args.jobs, use_cache=not args.no_cache)
+    all_results = report.to_dict()
+    total_issues = report.issue_count
+    total_warnings = report.warning_count
 
     if args.json:
         print(json.dumps(all_results, indent=2))
@@ -173,6 +582,12 @@ def main() -> None:
         if max_count - min_count > 3:
             print(f"  ⚠️ Doc count imbalance: {dict(counts)}")
 
+    if report.cache:
+        c = report.cache
+        if c["files"]:
+            print(f"  🗃️ Cache: {c['hits'] + c['rehashed']}/{c['files']} file(s) reused "
+                  f"({c['hit_rate']:.1%}; {c['rehashed']} re-hashed, {c['misses']} scanned)")
+
     print(f"{'='*60}")
     sys.exit(1 if total_issues > 0 else 0)
 
@@ -0,0 +1,446 @@
+"""
+http_pool.py — Shared keep-alive HTTP client for the DocMaintainer scripts.
+
+A zero-dependency replacement for ``urllib.request.urlopen`` that keeps one
+pool of persistent ``http.client`` connections per host, so a 100-page
+crawl or a long Jules poll loop pays for one TCP+TLS handshake instead of
+one per request.
+
+Errors are reported the same way urllib reports them — ``HTTPError`` for
+non-2xx responses and ``URLError`` for connection failures — so callers
+keep their existing ``except`` clauses.
+
+Usage:
+    import http_pool
+
+    req = urllib.request.Request(url, headers={...})
+    with http_pool.urlopen(req, timeout=15) as resp:
+        body = resp.read()
+
+Responses are transparently decoded from gzip/deflate, and from brotli when
+the optional ``brotli`` package is installed.
+"""
+
+import http.client
+import io
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from email.utils import parsedate_to_datetime
+
+try:
+    import brotli  # optional
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+DEFAULT_TIMEOUT = 15
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 8
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+# Exceptions that usually mean a pooled connection was closed by the server
+# while idle. Usually, not always: RemoteDisconnected and ConnectionResetError
+# can also mean the server got the request and dropped the connection before
+# answering, so a transparent retry on a fresh connection is only done for
+# idempotent methods unless the caller opts in (``retry_stale=True``). Other
+# methods never take an idle connection: they always open a fresh one, so a
+# POST sent after a long backoff cannot land on a socket the server closed.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+# ---------------------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------------------
+
+class RetryPolicy:
+    """
+    Exponential backoff shared by every script that talks HTTP.
+
+    Attempt *n* (1-based) waits ``backoff * multiplier ** n`` seconds, unless
+    the server sent a ``Retry-After`` header, which wins. With *max_wait*,
+    no wait (hinted or not) is longer than that many seconds.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 1.0,
+        multiplier: float = 2.0,
+        statuses: frozenset[int] = RETRY_STATUSES,
+        max_wait: float | None = None,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.statuses = statuses
+        self.max_wait = max_wait
+
+    def should_retry(self, status: int, attempt: int) -> bool:
+        return status in self.statuses and attempt < self.max_attempts
+
+    def wait(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to sleep before attempt *attempt* + 1."""
+        hinted = parse_retry_after(retry_after)
+        seconds = hinted if hinted is not None else self.backoff * (self.multiplier ** attempt)
+        return seconds if self.max_wait is None else min(seconds, self.max_wait)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+# ---------------------------------------------------------------------------
+# Responses
+# ---------------------------------------------------------------------------
+
+class Response:
+    """
+    A streaming, decoded HTTP response.
+
+    ``read(amt)`` returns *decoded* bytes, so callers never see
+    Content-Encoding. The underlying connection goes back to the pool as
+    soon as the body has been read to the end (or the response is closed).
+
+    ``timings`` holds the seconds spent opening connections (``connect``,
+    0 when a pooled one was reused) and waiting for response headers
+    (``ttfb``), summed over any redirects.
+    """
+
+    def __init__(self, pool: "ConnectionPool", key: tuple, conn, raw: http.client.HTTPResponse,
+                 url: str, history: list[dict]):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self.url = url
+        self.history = history          # [{"status": 301, "url": ...}, ...]
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        self.raw_bytes = 0              # bytes received on the wire
+        self.timings = {"connect": 0.0, "ttfb": 0.0}
+        self._decoder = _make_decoder(raw.headers.get("Content-Encoding", ""))
+        self._eof = False
+
+    # urllib compatibility
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def read(self, amt: int | None = None) -> bytes:
+        if self._eof:
+            return b""
+        if amt is None or amt < 0:
+            data = self._raw.read()
+            self.raw_bytes += len(data)
+            out = self._decode(data) + self._flush()
+            self._finish()
+            return out
+        while True:
+            data = self._raw.read(amt)
+            self.raw_bytes += len(data)
+            if not data:
+                out = self._flush()
+                self._finish()
+                return out
+            out = self._decode(data)
+            if out:
+                return out
+
+    def _decode(self, data: bytes) -> bytes:
+        return self._decoder.decompress(data) if self._decoder else data
+
+    def _flush(self) -> bytes:
+        if self._decoder is None:
+            return b""
+        flush = getattr(self._decoder, "flush", None)
+        return flush() if flush else b""
+
+    def _finish(self) -> None:
+        if self._eof:
+            return
+        self._eof = True
+        reusable = not self._raw.will_close and self._raw.isclosed()
+        self._pool._release(self._key, self._conn, reusable)
+
+    def close(self) -> None:
+        if self._eof:
+            return
+        if self._raw.length == 0:
+            # Empty body (HEAD, 204, 304): nothing to drain, keep the connection.
+            self._raw.read()
+            self._finish()
+        else:
+            # Unread body: the connection cannot carry another request.
+            self._eof = True
+            self._raw.close()
+            self._pool._release(self._key, self._conn, False)
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _DeflateDecoder:
+    """Deflate as sent in the wild: zlib-wrapped or raw."""
+
+    def __init__(self):
+        self._obj = None
+        self._first = True
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._first:
+            self._first = False
+            try:
+                self._obj = zlib.decompressobj()
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if self._obj else b""
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+
+def _make_decoder(encoding: str):
+    encoding = encoding.strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecoder()
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecoder()
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+class ConnectionPool:
+    """Thread-safe pool of idle keep-alive connections, keyed by host."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._lock = threading.Lock()
+        self._idle: dict[tuple, list] = {}
+        self._ssl_context = ssl.create_default_context()
+        self.stats = {"requests": 0, "connections": 0, "reused": 0}
+
+    # -- connection management ------------------------------------------------
+
+    def _acquire(self, key: tuple, timeout: float, reuse: bool = True):
+        scheme, host, port = key
+        with self._lock:
+            idle = self._idle.get(key) if reuse else None
+            if idle:
+                conn = idle.pop()
+                self.stats["reused"] += 1
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self.stats["connections"] += 1
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def _release(self, key: tuple, conn, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    # -- requests --------------------------------------------------------------
+
+    def _send(self, method: str, url: str, headers: dict, body: bytes | None, timeout: float,
+              retry_stale: bool):
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unsupported URL scheme: {scheme!r}")
+        port = parsed.port or (443 if scheme == "https" else 80)
+        key = (scheme, parsed.hostname or "", port)
+        target = parsed.path or "/"
+        if parsed.query:
+            target += "?" + parsed.query
+
+        while True:
+            conn, reused = self._acquire(key, timeout, reuse=retry_stale)
+            started = time.perf_counter()
+            connect = 0.0
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                    connect = time.perf_counter() - started
+                conn.request(method, target, body=body, headers=headers)
+                raw = conn.getresponse()
+            except STALE_CONNECTION_ERRORS as exc:
+                conn.close()
+                if reused and retry_stale:
+                    continue  # idle connection was dropped by the server
+                raise urllib.error.URLError(exc) from exc
+            except OSError as exc:
+                conn.close()
+                raise urllib.error.URLError(exc) from exc
+            except BaseException:
+                conn.close()
+                raise
+            self.stats["requests"] += 1
+            return key, conn, raw, {"connect": connect, "ttfb": time.perf_counter() - started - connect}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        body: bytes | None = None,
+        timeout: float | None = None,
+        retry: RetryPolicy | None = None,
+        follow_redirects: bool = True,
+        retry_stale: bool | None = None,
+    ) -> Response:
+        """
+        Send a request and return a streaming :class:`Response`.
+
+        Redirects are followed (up to ``MAX_REDIRECTS``). Non-2xx final
+        responses raise ``urllib.error.HTTPError`` (with the request's
+        ``timings`` attached); with a *retry* policy, statuses it covers are
+        retried with backoff first.
+
+        A pooled connection that turns out to be dead is replaced and the
+        request resent only for idempotent methods, or when *retry_stale*
+        is True. Otherwise (the default for POST, or *retry_stale* False)
+        the request goes out on a fresh connection and is never resent.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        headers = {k.title(): v for k, v in (headers or {}).items()}
+        headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+        headers.setdefault("Connection", "keep-alive")
+
+        if retry_stale is None:
+            retry_stale = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 1
+        while True:
+            try:
+                return self._request_once(method, url, headers, body, timeout, follow_redirects, retry_stale)
+            except urllib.error.HTTPError as exc:
+                if retry is None or not retry.should_retry(exc.code, attempt):
+                    raise
+                time.sleep(retry.wait(attempt, exc.headers.get("Retry-After")))
+                attempt += 1
+
+    def _request_once(self, method, url, headers, body, timeout, follow_redirects, retry_stale) -> Response:
+        history: list[dict] = []
+        timings = {"connect": 0.0, "ttfb": 0.0}
+        for _ in range(MAX_REDIRECTS + 1):
+            key, conn, raw, hop = self._send(method, url, headers, body, timeout, retry_stale)
+            for phase, seconds in hop.items():
+                timings[phase] += seconds
+            resp = Response(self, key, conn, raw, url, history)
+            resp.timings = timings
+            location = raw.headers.get("Location")
+            if follow_redirects and raw.status in REDIRECT_STATUSES and location:
+                resp.read()
+                history.append({"status": raw.status, "url": url})
+                url = urllib.parse.urljoin(url, location)
+                if raw.status == 303 or (raw.status in (301, 302) and method == "POST"):
+                    method, body = "GET", None
+                    headers.pop("Content-Type", None)
+                continue
+            if not 200 <= raw.status < 300:
+                payload = resp.read()
+                exc = urllib.error.HTTPError(url, raw.status, raw.reason, raw.headers, io.BytesIO(payload))
+                exc.timings = timings
+                raise exc
+            return resp
+        raise urllib.error.HTTPError(url, raw.status, "Too many redirects", raw.headers, io.BytesIO(b""))
+
+
+# ---------------------------------------------------------------------------
+# Module-level shared pool
+# ---------------------------------------------------------------------------
+
+_default_pool: ConnectionPool | None = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> ConnectionPool:
+    """Return the process-wide pool shared by every caller in this process."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+        return _default_pool
+
+
+def urlopen(
+    req: "urllib.request.Request | str",
+    data: bytes | None = None,
+    timeout: float | None = None,
+    retry: RetryPolicy | None = None,
+    retry_stale: bool | None = None,
+) -> Response:
+    """Drop-in for ``urllib.request.urlopen`` backed by the shared pool."""
+    if isinstance(req, str):
+        req = urllib.request.Request(req, data=data)
+    elif data is not None:
+        req.data = data
+    return default_pool().request(
+        req.get_method(),
+        req.full_url,
+        headers=dict(req.header_items()),
+        body=req.data,
+        timeout=timeout,
+        retry=retry,
+        retry_stale=retry_stale,
+    )
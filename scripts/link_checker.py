@@ -0,0 +1,202 @@
+"""
+link_checker.py — Concurrent liveness check for external links found by the crawler.
+
+Every unique URL is checked once with ``HEAD``; servers that reject or
+mishandle HEAD get a ``GET`` with ``Range: bytes=0-0`` instead, so no
+page bodies are downloaded. Requests go through the shared http_pool,
+redirect chains are recorded, and results are kept in
+``_link_check_cache.json`` so a link is only re-checked once its entry is
+older than the TTL.
+
+Each result is classified as:
+
+  ok           2xx after redirects
+  dead         404/410, or the host does not resolve / refuses connections
+  unreachable  anything else (403 to bots, 429, 5xx, timeouts) — not
+               conclusive
+
+Only ``ok`` results and HTTP 404/410 are cached; everything else is
+checked again on the next run.
+
+Usage:
+    import link_checker
+
+    results, stats = link_checker.check_links(urls, cache_dir=output_dir,
+                                              throttle=HostThrottle(0.5))
+"""
+
+import contextlib
+import json
+import os
+import socket
+import time
+import urllib.error
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import http_pool
+
+CACHE_FILE = "_link_check_cache.json"
+DEFAULT_TTL = timedelta(days=7)
+DEFAULT_WORKERS = 32
+TIMEOUT = 10
+USER_AGENT = "DocMaintainer-LinkChecker/1.0 (+https://github.com/user/DocMaintainer)"
+
+DEAD_STATUSES = frozenset({404, 410})
+# HEAD answers that say more about the server's HEAD support than the URL
+HEAD_FALLBACK_STATUSES = frozenset({400, 403, 404, 405, 429, 500, 501, 503})
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def load_cache(cache_dir: str) -> dict:
+    path = os.path.join(cache_dir, CACHE_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as fin:
+            return json.load(fin)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache_dir: str, cache: dict) -> None:
+    path = os.path.join(cache_dir, CACHE_FILE)
+    with open(path, "w", encoding="utf-8") as fout:
+        json.dump(dict(sorted(cache.items())), fout, indent=1)
+
+
+def _fresh(entry: dict, now: datetime, ttl: timedelta) -> bool:
+    try:
+        return now - datetime.fromisoformat(entry["checked"]) < ttl
+    except (KeyError, ValueError):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Checking
+# ---------------------------------------------------------------------------
+
+def _request(method: str, url: str) -> dict:
+    headers = {"User-Agent": USER_AGENT}
+    if method == "GET":
+        headers["Range"] = "bytes=0-0"
+    with http_pool.default_pool().request(method, url, headers=headers, timeout=TIMEOUT) as resp:
+        return {
+            "status": resp.status,
+            "final_url": resp.url,
+            "redirects": resp.history,
+        }
+
+
+def _is_dns_or_refused(exc: urllib.error.URLError) -> bool:
+    reason = exc.reason
+    return isinstance(reason, (socket.gaierror, ConnectionRefusedError))
+
+
+def check_url(url: str, throttle=None, slot=contextlib.nullcontext) -> dict:
+    """Check one URL. Never raises; the outcome is in ``state``."""
+    host = urllib.parse.urlparse(url).netloc.lower()
+    result = {"url": url, "state": "unreachable", "status": None, "method": "HEAD",
+              "final_url": url, "redirects": [], "error": None}
+    for method in ("HEAD", "GET"):
+        result["method"] = method
+        if throttle is not None:
+            throttle.acquire(host)
+        try:
+            with slot():
+                result.update(_request(method, url))
+            result["state"] = "ok"
+            result["error"] = None
+            break
+        except urllib.error.HTTPError as exc:
+            result["status"] = exc.code
+            result["error"] = f"HTTP {exc.code}"
+            result["state"] = "dead" if exc.code in DEAD_STATUSES else "unreachable"
+            if method == "HEAD" and exc.code in HEAD_FALLBACK_STATUSES:
+                continue
+            break
+        except urllib.error.URLError as exc:
+            result["error"] = str(exc.reason)
+            result["state"] = "dead" if _is_dns_or_refused(exc) else "unreachable"
+            break
+        except (OSError, ValueError) as exc:  # timeouts, malformed URLs
+            result["error"] = str(exc) or exc.__class__.__name__
+            break
+    return result
+
+
+def _interleave_by_host(urls: list[str]) -> list[str]:
+    """Round-robin URLs across hosts so workers don't all queue on one host's throttle."""
+    by_host: dict[str, list[str]] = defaultdict(list)
+    for url in urls:
+        by_host[urllib.parse.urlparse(url).netloc.lower()].append(url)
+    ordered = []
+    queues = list(by_host.values())
+    for i in range(max((len(q) for q in queues), default=0)):
+        ordered.extend(q[i] for q in queues if i < len(q))
+    return ordered
+
+
+def check_links(
+    urls,
+    cache_dir: str | None = None,
+    throttle=None,
+    workers: int = DEFAULT_WORKERS,
+    ttl: timedelta = DEFAULT_TTL,
+    slot=contextlib.nullcontext,
+) -> tuple[dict[str, dict], dict]:
+    """
+    Check every unique URL in *urls* concurrently.
+
+    *throttle* is anything with an ``acquire(host)`` method (the crawler
+    passes its ``HostThrottle``); *slot* is a context-manager factory
+    wrapped around each request, used for the --all-repos global cap.
+
+    Returns ``(results, stats)`` where *results* maps url -> result dict.
+    """
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    cache = load_cache(cache_dir) if cache_dir else {}
+    unique = list(dict.fromkeys(urls))
+
+    results: dict[str, dict] = {}
+    todo = []
+    for url in unique:
+        entry = cache.get(url)
+        if entry and _fresh(entry, now, ttl):
+            results[url] = entry
+        else:
+            todo.append(url)
+    cached = len(results)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="link-check") as pool:
+        for result in pool.map(lambda u: check_url(u, throttle, slot), _interleave_by_host(todo)):
+            result["checked"] = now.isoformat()
+            results[result["url"]] = result
+            # Only definitive answers are cached; a DNS hiccup must not mark
+            # a link dead for a week.
+            if result["state"] == "ok" or result["status"] in DEAD_STATUSES:
+                cache[result["url"]] = result
+            else:
+                cache.pop(result["url"], None)
+
+    if cache_dir:
+        save_cache(cache_dir, cache)
+
+    states = [r["state"] for r in results.values()]
+    stats = {
+        "links": len(unique),
+        "checked": len(todo),
+        "cached": cached,
+        "ok": states.count("ok"),
+        "dead": states.count("dead"),
+        "unreachable": states.count("unreachable"),
+        "redirected": sum(1 for r in results.values() if r["redirects"]),
+        "seconds": float(f"{time.perf_counter() - started:.2f}"),
+    }
+    return {url: results[url] for url in unique}, stats
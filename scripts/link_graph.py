@@ -0,0 +1,183 @@
+"""
+link_graph.py — Indexed page→link graph written by the crawler.
+
+Every crawl writes ``scraped_docs/_link_graph.sqlite``: one row per URL
+(crawled pages and every link target, internal or external) with an
+integer id, and one row per distinct link between them. Edges are stored
+``WITHOUT ROWID`` and indexed in both directions, so "who links here" and
+"what does this page link to" are index lookups rather than re-scans of
+the scraped text.
+
+Internal URLs are stored in ``crawler.normalize_url`` form; external URLs
+exactly as they appear in the page.
+
+Node ``state`` is ``ok``, ``dead`` or ``unreachable`` when known (crawled
+pages, and external links when the crawl ran with ``--check-links``),
+otherwise NULL.
+
+Usage:
+    python scripts/link_graph.py ClaudeCodeDocs/scraped_docs/_link_graph.sqlite orphans
+    python scripts/link_graph.py <graph> inbound https://code.claude.com/docs/en/hooks
+    python scripts/link_graph.py <graph> dead
+
+    from link_graph import LinkGraph
+    with LinkGraph(path) as graph:
+        graph.pages_linking_to_dead()
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+GRAPH_FILE = "_link_graph.sqlite"
+
+SCHEMA = """
+CREATE TABLE nodes (
+    id       INTEGER PRIMARY KEY,
+    url      TEXT NOT NULL UNIQUE,
+    internal INTEGER NOT NULL,      -- 1 inside the crawl boundary
+    crawled  INTEGER NOT NULL,      -- 1 fetched by this crawl
+    state    TEXT                   -- ok / dead / unreachable / NULL (unknown)
+);
+CREATE TABLE edges (
+    src INTEGER NOT NULL,
+    dst INTEGER NOT NULL,
+    PRIMARY KEY (src, dst)
+) WITHOUT ROWID;
+CREATE INDEX edges_dst ON edges (dst, src);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+"""
+
+
+def write_graph(
+    path: str,
+    start_url: str,
+    crawled: dict[str, str | None],
+    edges: dict[str, list[str]],
+    internal_prefix: str,
+    states: dict[str, str] | None = None,
+) -> dict:
+    """
+    Replace the graph at *path*.
+
+    *crawled* maps each crawled page to its state, *edges* maps a page to
+    the URLs it links to (in page order, duplicates allowed), and *states*
+    adds known states for other nodes (e.g. checked external links).
+    Returns ``{"nodes": n, "edges": m}``.
+    """
+    states = states or {}
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        ids: dict[str, int] = {}
+
+        def node_id(url: str) -> int:
+            if url not in ids:
+                ids[url] = len(ids) + 1
+            return ids[url]
+
+        for url in crawled:
+            node_id(url)
+        pairs = {(node_id(src), node_id(dst)) for src, targets in edges.items() for dst in targets}
+        pairs = {(src, dst) for src, dst in pairs if src != dst}
+
+        conn.executemany(
+            "INSERT INTO nodes (id, url, internal, crawled, state) VALUES (?, ?, ?, ?, ?)",
+            (
+                (nid, url, int(url.startswith(internal_prefix)), int(url in crawled),
+                 crawled[url] if url in crawled else states.get(url))
+                for url, nid in ids.items()
+            ),
+        )
+        conn.executemany("INSERT INTO edges (src, dst) VALUES (?, ?)", sorted(pairs))
+        conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                         [("start_url", start_url), ("internal_prefix", internal_prefix)])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return {"nodes": len(ids), "edges": len(pairs)}
+
+
+class LinkGraph:
+    """Read-only query API over a ``_link_graph.sqlite`` file."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        self.start_url = self._meta("start_url")
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _urls(self, sql: str, params: tuple = ()) -> list[str]:
+        return [row[0] for row in self._conn.execute(sql, params)]
+
+    def inbound(self, url: str) -> list[str]:
+        """Pages that link to *url*."""
+        return self._urls(
+            "SELECT s.url FROM nodes d JOIN edges e ON e.dst = d.id JOIN nodes s ON s.id = e.src "
+            "WHERE d.url = ? ORDER BY s.url", (url,))
+
+    def outbound(self, url: str) -> list[str]:
+        """URLs that *url* links to."""
+        return self._urls(
+            "SELECT d.url FROM nodes s JOIN edges e ON e.src = s.id JOIN nodes d ON d.id = e.dst "
+            "WHERE s.url = ? ORDER BY d.url", (url,))
+
+    def orphans(self) -> list[str]:
+        """Crawled pages that no other crawled page links to (the start page excepted)."""
+        return self._urls(
+            "SELECT n.url FROM nodes n WHERE n.crawled = 1 AND n.url != ? AND NOT EXISTS ("
+            "  SELECT 1 FROM edges e JOIN nodes s ON s.id = e.src WHERE e.dst = n.id AND s.crawled = 1"
+            ") ORDER BY n.url", (self.start_url or "",))
+
+    def pages_linking_to_dead(self) -> dict[str, list[str]]:
+        """Dead URL -> pages that link to it."""
+        result: dict[str, list[str]] = {}
+        for dead, src in self._conn.execute(
+            "SELECT d.url, s.url FROM nodes d JOIN edges e ON e.dst = d.id JOIN nodes s ON s.id = e.src "
+            "WHERE d.state = 'dead' ORDER BY d.url, s.url"
+        ):
+            result.setdefault(dead, []).append(src)
+        return result
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "LinkGraph":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Query a crawler link graph.")
+    ap.add_argument("graph", help=f"Path to {GRAPH_FILE}")
+    ap.add_argument("query", choices=["inbound", "outbound", "orphans", "dead"])
+    ap.add_argument("url", nargs="?", help="Page URL (inbound/outbound)")
+    args = ap.parse_args()
+
+    if args.query in ("inbound", "outbound") and not args.url:
+        ap.error(f"{args.query} needs a URL")
+    with LinkGraph(args.graph) as graph:
+        if args.query == "inbound":
+            result = graph.inbound(args.url)
+        elif args.query == "outbound":
+            result = graph.outbound(args.url)
+        elif args.query == "orphans":
+            result = graph.orphans()
+        else:
+            result = graph.pages_linking_to_dead()
+    print(json.dumps(result, indent=2))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
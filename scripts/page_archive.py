@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+page_archive.py — Single-file, compressed snapshot of scraped_docs pages.
+
+With ``crawler.py --layout archive`` the crawl packs every page into
+``scraped_docs/_pages.archive`` instead of leaving hundreds of small
+``.txt``/``.md`` files behind. Each page text is compressed on its own
+(zstd when the optional ``zstandard`` package is installed, zlib
+otherwise), so the reader memory-maps the file and decompresses only the
+page it is asked for.
+
+File layout::
+
+    header   b"DMPA" | version u8 | codec u8 | 2 reserved bytes
+    blobs    one compressed page text after another
+    index    zlib-compressed JSON:
+             {"files": {name: [offset, length, size, sha256]},
+              "urls":  {url: name}}          # aliases share a name
+    footer   index offset u64 | index length u64 | b"DMPA"
+
+Usage:
+    python scripts/page_archive.py GeminiDocs/scraped_docs/_pages.archive list
+    python scripts/page_archive.py <archive> get https://geminicli.com/docs/cli
+    python scripts/page_archive.py <archive> extract /tmp/pages   # back to plain files
+
+    from page_archive import PageArchive
+    with PageArchive(path) as archive:
+        text = archive.get(url)
+        for url, text in archive.iter_pages():
+            ...
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is always available
+    zstandard = None
+
+ARCHIVE_FILE = "_pages.archive"
+MAGIC = b"DMPA"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2x")
+FOOTER = struct.Struct("<QQ4s")
+CODECS = {1: "zlib", 2: "zstd"}
+CODEC_IDS = {name: cid for cid, name in CODECS.items()}
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def _compressor(codec: str):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd archives need the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=9).compress
+    return lambda data: zlib.compress(data, 6)
+
+
+def _decompressor(codec: str):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd archives need the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class ArchiveWriter:
+    """
+    Build an archive at *path*. Written to a temporary file and moved into
+    place by :meth:`close`, so readers never see a half-written archive.
+    """
+
+    def __init__(self, path: str, codec: str | None = None):
+        self.path = path
+        self.codec = codec or default_codec()
+        self._compress = _compressor(self.codec)
+        self._tmp_path = path + ".tmp"
+        self._out = open(self._tmp_path, "wb")
+        self._out.write(HEADER.pack(MAGIC, VERSION, CODEC_IDS[self.codec]))
+        self._files: dict[str, list] = {}
+        self._urls: dict[str, str] = {}
+
+    def add(self, name: str, text: str) -> None:
+        """Store page text under file *name*."""
+        data = text.encode("utf-8")
+        self.add_blob(name, self._compress(data), len(data), hashlib.sha256(data).hexdigest())
+
+    def add_blob(self, name: str, blob: bytes, size: int, sha256: str) -> None:
+        """Store an already compressed blob (copied from another archive of the same codec)."""
+        self._files[name] = [self._out.tell(), len(blob), size, sha256]
+        self._out.write(blob)
+
+    def map_url(self, url: str, name: str) -> None:
+        self._urls[url] = name
+
+    def close(self) -> dict:
+        index = zlib.compress(json.dumps({"files": self._files, "urls": self._urls}).encode())
+        offset = self._out.tell()
+        self._out.write(index)
+        self._out.write(FOOTER.pack(offset, len(index), MAGIC))
+        self._out.close()
+        os.replace(self._tmp_path, self.path)
+        return {"path": self.path, "codec": self.codec, "files": len(self._files),
+                "urls": len(self._urls), "bytes": os.path.getsize(self.path)}
+
+    def abort(self) -> None:
+        self._out.close()
+        os.remove(self._tmp_path)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+class PageArchive:
+    """Random-access reader over a memory-mapped archive."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fin:
+            self._mm = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, codec_id = HEADER.unpack_from(self._mm, 0)
+            offset, length, tail = FOOTER.unpack_from(self._mm, len(self._mm) - FOOTER.size)
+            if magic != MAGIC or tail != MAGIC or version != VERSION or codec_id not in CODECS:
+                raise ValueError(f"{path} is not a page archive")
+            self.codec = CODECS[codec_id]
+            self._decompress = _decompressor(self.codec)
+            index = json.loads(zlib.decompress(self._mm[offset:offset + length]))
+            self._files: dict[str, list] = index["files"]
+            self._urls: dict[str, str] = index["urls"]
+        except (struct.error, zlib.error, KeyError, TypeError) as exc:
+            # Truncated or corrupted: report it like any other non-archive
+            self._mm.close()
+            raise ValueError(f"{path} is not a page archive ({exc})") from exc
+        except BaseException:
+            self._mm.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def urls(self) -> list[str]:
+        return list(self._urls)
+
+    def files(self) -> dict[str, str]:
+        """File name -> the first URL archived under it (the page that owns it)."""
+        owners: dict[str, str] = {}
+        for url, name in self._urls.items():
+            owners.setdefault(name, url)
+        return owners
+
+    def has_file(self, name: str) -> bool:
+        return name in self._files
+
+    def file_info(self, name: str) -> dict:
+        offset, length, size, sha256 = self._files[name]
+        return {"offset": offset, "length": length, "size": size, "sha256": sha256}
+
+    def blob(self, name: str) -> bytes:
+        """The compressed bytes stored for file *name*."""
+        offset, length, _size, _sha = self._files[name]
+        return self._mm[offset:offset + length]
+
+    def read_file(self, name: str) -> str:
+        return self._decompress(self.blob(name)).decode("utf-8")
+
+    def get(self, url: str) -> str:
+        """Extracted text of *url*. Raises KeyError if it is not archived."""
+        return self.read_file(self._urls[url])
+
+    def iter_pages(self):
+        """Yield ``(url, text)`` for every archived URL, in file order."""
+        order = sorted(self._urls.items(), key=lambda item: self._files[item[1]][0])
+        for url, name in order:
+            yield url, self.read_file(name)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Read a scraped_docs page archive.")
+    ap.add_argument("archive", help=f"Path to {ARCHIVE_FILE}")
+    ap.add_argument("command", choices=["list", "get", "extract"])
+    ap.add_argument("target", nargs="?", help="URL (get) or output directory (extract)")
+    args = ap.parse_args()
+
+    if args.command in ("get", "extract") and not args.target:
+        ap.error(f"{args.command} needs a {'URL' if args.command == 'get' else 'directory'}")
+    with PageArchive(args.archive) as archive:
+        if args.command == "list":
+            for url in sorted(archive.urls()):
+                print(url)
+        elif args.command == "get":
+            try:
+                sys.stdout.write(archive.get(args.target))
+            except KeyError:
+                print(f"❌ Not in archive: {args.target}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            from page_store import page_header
+            os.makedirs(args.target, exist_ok=True)
+            files = archive.files()
+            for name, url in files.items():
+                with open(os.path.join(args.target, name), "w", encoding="utf-8") as fout:
+                    fout.write(page_header(url))
+                    fout.write(archive.read_file(name))
+            print(f"✅ Extracted {len(files)} file(s) to {args.target}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+page_store.py — Content-addressed store for crawler output in scraped_docs/.
+
+Each page is still saved as a readable ``<name>.txt`` file, but files are
+only rewritten when the SHA-256 of the extracted text changes, and pages
+with identical text are stored once. Per-page timestamps live in a single
+``_manifest.json`` instead of inside every file, so an unchanged page
+leaves ``git status`` clean.
+
+With ``layout="archive"`` the page files are packed into a single
+``_pages.archive`` (see page_archive.py) when the crawl finishes; pages
+unchanged since the last crawl are copied over as compressed blobs, and
+``file`` in the manifest names the page inside the archive.
+
+Manifest layout::
+
+    {
+      "updated": "<iso timestamp>",
+      "pages": {
+        "<normalized url>": {
+          "url": "...", "file": "cli-reference.txt", "sha256": "...",
+          "first_seen": "...", "changed": "...", "checked": "...",
+          "sections": [{"anchor": "usage", "title": "Usage", "sha256": "<16 hex>"}, ...],
+          "alias_of": "<url>",         # only for duplicate pages
+          "near_duplicate": true       # alias by SimHash rather than exact hash
+        }
+      }
+    }
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+from page_archive import ARCHIVE_FILE, ArchiveWriter, PageArchive
+
+MANIFEST_FILE = "_manifest.json"
+
+
+def page_header(url: str) -> str:
+    """Header written at the top of every page file, before the extracted text."""
+    return f"URL: {url}\n\n"
+
+
+def read_page_text(path: str) -> str:
+    """Return the extracted text of a page file, without its header."""
+    with open(path, encoding="utf-8") as fin:
+        content = fin.read()
+    _, sep, text = content.partition("\n\n")
+    return text if sep else content
+
+
+def diff_sections(old: list[dict], new: list[dict]) -> list[dict]:
+    """Sections of *new* that are added or changed, then those removed, by anchor."""
+    before = {s["anchor"]: s for s in old}
+    after = {s["anchor"] for s in new}
+    changes = []
+    for section in new:
+        prev = before.get(section["anchor"])
+        if prev is None or prev["sha256"] != section["sha256"]:
+            changes.append({"anchor": section["anchor"], "title": section["title"],
+                            "change": "added" if prev is None else "changed"})
+    for section in old:
+        if section["anchor"] not in after:
+            changes.append({"anchor": section["anchor"], "title": section["title"], "change": "removed"})
+    return changes
+
+
+class PageStore:
+    """
+    Tracks which pages of the current crawl were added, changed, left
+    unchanged, deduplicated or removed, relative to the previous crawl's
+    manifest. The crawler calls exactly one of :meth:`commit`,
+    :meth:`keep` or :meth:`retain` per visited page, then :meth:`finish`.
+    """
+
+    def __init__(self, output_dir: str, key=lambda url: url, layout: str = "files"):
+        self.output_dir = output_dir
+        self._key = key
+        self.layout = layout
+        self.archive = self._open_archive() if layout == "archive" else None
+        self.now = datetime.now(timezone.utc).isoformat()
+        self.previous: dict[str, dict] = self._load()
+        self.pages: dict[str, dict] = {}
+        self._by_hash: dict[str, str] = {}   # sha256 -> key of the page that owns the file
+        self.delta: dict[str, list[str]] = {
+            "added": [], "changed": [], "removed": [], "duplicates": [], "near_duplicates": [],
+        }
+        self.unchanged = 0
+        # url -> [{"anchor", "title", "change"}] for pages whose text changed
+        self.section_changes: dict[str, list[dict]] = {}
+
+    def _load(self) -> dict:
+        path = os.path.join(self.output_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding="utf-8") as fin:
+                return json.load(fin).get("pages", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _open_archive(self) -> PageArchive | None:
+        path = self._path(ARCHIVE_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            return PageArchive(path)
+        except (OSError, ValueError, RuntimeError):
+            return None
+
+    def _path(self, fname: str) -> str:
+        return os.path.join(self.output_dir, fname)
+
+    def _exists(self, fname: str) -> bool:
+        return os.path.exists(self._path(fname)) or (self.archive is not None and self.archive.has_file(fname))
+
+    def stored_file(self, url: str) -> str | None:
+        """Path of the file holding *url*'s text from the last crawl, if still on disk (or archived)."""
+        entry = self.previous.get(self._key(url))
+        if entry and self._exists(entry["file"]):
+            return self._path(entry["file"])
+        return None
+
+    def commit(self, url: str, fname: str, tmp_path: str, sha256: str,
+               near_dup_of: str | None = None, sections: list[dict] | None = None) -> str:
+        """
+        Store freshly extracted text (streamed to *tmp_path*). Returns
+        ``added``, ``changed``, ``unchanged``, ``duplicate`` or
+        ``near_duplicate``.
+
+        *near_dup_of* names an already committed page whose text is nearly
+        the same; unless the text is an exact duplicate of some other page,
+        this page is then stored as an alias of it.
+
+        *sections* is the page's per-heading hash index; when both this and
+        the previous crawl have one, changed sections are recorded in
+        :attr:`section_changes`.
+        """
+        key = self._key(url)
+        prev = self.previous.get(key)
+        owner = self._by_hash.get(sha256)
+        near = False
+        if (owner is None or owner == key) and near_dup_of is not None:
+            owner, near = self._key(near_dup_of), True
+
+        if owner is not None and owner != key:
+            os.remove(tmp_path)
+            if prev and not prev.get("alias_of") and prev["file"] != self.pages[owner]["file"]:
+                self._discard(prev["file"])
+            self.pages[key] = {
+                "url": url,
+                "file": self.pages[owner]["file"],
+                "sha256": sha256,
+                "first_seen": prev["first_seen"] if prev else self.now,
+                "changed": prev["changed"] if prev and prev["sha256"] == sha256 else self.now,
+                "checked": self.now,
+                "alias_of": self.pages[owner]["url"],
+            }
+            if near:
+                self.pages[key]["near_duplicate"] = True
+                self.delta["near_duplicates"].append(url)
+                return "near_duplicate"
+            self.delta["duplicates"].append(url)
+            return "duplicate"
+
+        fpath = self._path(fname)
+        if prev and prev["sha256"] == sha256 and not prev.get("alias_of") \
+                and prev["file"] == fname and self._exists(fname):
+            os.remove(tmp_path)
+            status = "unchanged"
+            self.unchanged += 1
+        else:
+            os.replace(tmp_path, fpath)
+            if prev and not prev.get("alias_of") and prev["file"] != fname:
+                self._discard(prev["file"])
+            if prev and prev["sha256"] == sha256 and not prev.get("alias_of"):
+                status = "unchanged"  # same text, file rewritten (lost, or --layout switched)
+                self.unchanged += 1
+            else:
+                status = "changed" if prev else "added"
+                self.delta[status].append(url)
+
+        self.pages[key] = {
+            "url": url,
+            "file": fname,
+            "sha256": sha256,
+            "first_seen": prev["first_seen"] if prev else self.now,
+            "changed": prev["changed"] if status == "unchanged" else self.now,
+            "checked": self.now,
+        }
+        if sections is not None:
+            self.pages[key]["sections"] = sections
+            changes = diff_sections(prev.get("sections") or [], sections) if status == "changed" else []
+            if changes and prev.get("sections") is not None:
+                self.section_changes[url] = changes
+        self._by_hash.setdefault(sha256, key)
+        return status
+
+    def keep(self, url: str) -> str:
+        """
+        Record a page whose content is known not to have changed (HTTP 304
+        or identical body) without touching its file. Only valid for pages
+        that :meth:`stored_file` found on disk. Returns ``unchanged``.
+        """
+        key = self._key(url)
+        prev = self.previous[key]
+        self.pages[key] = dict(prev, url=url, checked=self.now)
+        if not prev.get("alias_of"):
+            self._by_hash.setdefault(prev["sha256"], key)
+        self.unchanged += 1
+        return "unchanged"
+
+    def retain(self, url: str) -> None:
+        """Carry a page that failed this crawl over from the previous manifest."""
+        key = self._key(url)
+        if key in self.previous:
+            self.pages[key] = self.previous[key]
+
+    def restore(self, url: str, entry: dict | None, status: str | None,
+                section_changes: list[dict] | None = None) -> None:
+        """Re-apply a page committed by an interrupted crawl (see ``--resume``)."""
+        key = self._key(url)
+        if section_changes:
+            self.section_changes[url] = section_changes
+        if entry is None:
+            self.retain(url)
+            return
+        self.pages[key] = entry
+        if not entry.get("alias_of"):
+            self._by_hash.setdefault(entry["sha256"], key)
+        if status == "unchanged":
+            self.unchanged += 1
+        elif status == "duplicate":
+            self.delta["duplicates"].append(url)
+        elif status == "near_duplicate":
+            self.delta["near_duplicates"].append(url)
+        elif status in ("added", "changed"):
+            self.delta[status].append(url)
+
+    def _discard(self, fname: str) -> None:
+        if any(p["file"] == fname for p in self.pages.values()):
+            return
+        try:
+            os.remove(self._path(fname))
+        except FileNotFoundError:
+            pass
+
+    def finish(self, complete: bool) -> dict:
+        """
+        Write the manifest and return the delta against the previous crawl.
+
+        Pages missing from this crawl are only treated as removed when the
+        crawl was *complete* (the frontier ran dry); after a truncated crawl
+        they are carried over unchanged.
+        """
+        for key, entry in self.previous.items():
+            if key in self.pages:
+                continue
+            if complete:
+                self.delta["removed"].append(entry["url"])
+                if not entry.get("alias_of"):
+                    self._discard(entry["file"])
+            else:
+                self.pages[key] = entry
+
+        archive = None
+        if self.layout == "archive":
+            archive = self._pack()
+        elif os.path.exists(self._path(ARCHIVE_FILE)):
+            os.remove(self._path(ARCHIVE_FILE))  # back to plain files: the archive is stale
+
+        path = os.path.join(self.output_dir, MANIFEST_FILE)
+        with open(path, "w", encoding="utf-8") as fout:
+            json.dump({"updated": self.now, "pages": dict(sorted(self.pages.items()))}, fout, indent=1)
+
+        return {
+            "layout": self.layout,
+            "archive": archive,
+            "added": len(self.delta["added"]),
+            "changed": len(self.delta["changed"]),
+            "unchanged": self.unchanged,
+            "removed": len(self.delta["removed"]),
+            "duplicates": len(self.delta["duplicates"]),
+            "near_duplicates": len(self.delta["near_duplicates"]),
+        }
+
+    def _pack(self) -> dict:
+        """
+        Write every stored page into a fresh archive: loose files written by
+        this crawl are compressed and removed, unchanged pages are copied
+        from the previous archive without recompressing.
+        """
+        writer = ArchiveWriter(self._path(ARCHIVE_FILE))
+        written: set[str] = set()
+        loose: list[str] = []
+        entries = sorted(self.pages.values(), key=lambda e: (bool(e.get("alias_of")), e["url"]))
+        try:
+            for entry in entries:
+                name = entry["file"]
+                if name not in written:
+                    fpath = self._path(name)
+                    if os.path.exists(fpath):
+                        writer.add(name, read_page_text(fpath))
+                        loose.append(fpath)
+                    elif self.archive is not None and self.archive.has_file(name):
+                        if self.archive.codec == writer.codec:
+                            info = self.archive.file_info(name)
+                            writer.add_blob(name, self.archive.blob(name), info["size"], info["sha256"])
+                        else:
+                            writer.add(name, self.archive.read_file(name))
+                    else:
+                        continue  # lost from disk; refetched next crawl
+                    written.add(name)
+                writer.map_url(entry["url"], name)
+        except BaseException:
+            writer.abort()
+            raise
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+        stats = writer.close()
+        for fpath in loose:
+            os.remove(fpath)
+        return stats
@@ -0,0 +1,214 @@
+"""
+robots.py — Cached robots.txt policies for the crawler.
+
+Each origin's ``robots.txt`` is fetched at most once per run and kept in
+``scraped_docs/_robots_cache.json``; a later crawl reuses it until the
+entry is older than the TTL. Rules are parsed with
+``urllib.robotparser`` and matched against the crawler's User-Agent.
+
+How a fetch result becomes a policy (after RFC 9309):
+
+  2xx          the file's rules
+  4xx          no rules (everything allowed)
+  5xx / error  everything allowed for this run only; the entry is not
+               cached, so the next crawl asks again
+
+``Crawl-delay`` (or ``Request-rate``) becomes the host's pacing floor in
+the crawler's throttle, capped at ``MAX_CRAWL_DELAY``.
+
+Usage:
+    from robots import RobotsCache
+
+    robots = RobotsCache(cache_dir=output_dir)
+    robots.allowed("https://geminicli.com/docs/cli")   # False if disallowed
+    robots.crawl_delay("https://geminicli.com/docs/")  # seconds or None
+    robots.save()
+"""
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import urllib.robotparser
+from datetime import datetime, timedelta, timezone
+
+import http_pool
+
+CACHE_FILE = "_robots_cache.json"
+DEFAULT_TTL = timedelta(hours=24)
+MAX_CRAWL_DELAY = 30.0
+TIMEOUT = 15
+USER_AGENT = "DocMaintainer-Crawler/1.0 (+https://github.com/user/DocMaintainer)"
+AGENT_TOKEN = "docmaintainer-crawler"
+
+
+def declared_delay(lines: list[str]) -> float | None:
+    """
+    Seconds between requests asked of us by ``Crawl-delay`` or
+    ``Request-rate`` (``n/seconds``). A group naming our agent wins over
+    ``*``. Parsed here because ``urllib.robotparser`` only accepts whole
+    seconds.
+    """
+    delays: dict[str, float] = {}   # "ours" / "any" -> seconds
+    agents: list[str] = []
+    in_rules = False
+    for raw in lines:
+        key, sep, value = raw.split("#", 1)[0].partition(":")
+        if not sep:
+            continue
+        key, value = key.strip().lower(), value.strip()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if key == "crawl-delay":
+            try:
+                seconds = float(value)
+            except ValueError:
+                continue
+        elif key == "request-rate":
+            requests, _, period = value.partition("/")
+            try:
+                seconds = float(period) / float(requests)
+            except (ValueError, ZeroDivisionError):
+                continue
+        else:
+            continue
+        for agent in agents:
+            group = "ours" if agent not in ("", "*") and agent in AGENT_TOKEN else "any" if agent == "*" else None
+            if group:
+                delays[group] = max(delays.get(group, 0.0), seconds)
+    delay = delays.get("ours", delays.get("any"))
+    return min(delay, MAX_CRAWL_DELAY) if delay is not None else None
+
+
+def origin_of(url: str) -> str:
+    parsed = urllib.parse.urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+class RobotsPolicy:
+    """The parsed robots.txt of one origin."""
+
+    def __init__(self, origin: str, status: int | None, lines: list[str], fetched: str, source: str):
+        self.origin = origin
+        self.status = status
+        self.lines = lines
+        self.fetched = fetched
+        self.source = source      # "fetched", "cached" or "unavailable"
+        self.disallowed = 0       # URLs refused this run
+        self._parser = urllib.robotparser.RobotFileParser(f"{origin}/robots.txt")
+        self._parser.parse(lines)
+
+    def allowed(self, url: str) -> bool:
+        return self._parser.can_fetch(USER_AGENT, url)
+
+    @property
+    def crawl_delay(self) -> float | None:
+        """Declared seconds between requests, from Crawl-delay or Request-rate."""
+        return declared_delay(self.lines)
+
+    @property
+    def sitemaps(self) -> list[str]:
+        return [urllib.parse.urljoin(self.origin + "/", url) for url in self._parser.site_maps() or []]
+
+    def stats(self) -> dict:
+        return {
+            "status": self.status,
+            "source": self.source,
+            "fetched": self.fetched,
+            "crawl_delay": self.crawl_delay,
+            "disallowed": self.disallowed,
+        }
+
+
+class RobotsCache:
+    """Per-origin robots policies, persisted in *cache_dir* with a TTL."""
+
+    def __init__(self, cache_dir: str | None = None, ttl: timedelta = DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._policies: dict[str, RobotsPolicy] = {}
+        self._stored = self._load()
+
+    # -- persistence --------------------------------------------------------
+
+    def _path(self) -> str | None:
+        return os.path.join(self.cache_dir, CACHE_FILE) if self.cache_dir else None
+
+    def _load(self) -> dict:
+        path = self._path()
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding="utf-8") as fin:
+                return json.load(fin)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self) -> None:
+        path = self._path()
+        if not path:
+            return
+        with self._lock:
+            for origin, policy in self._policies.items():
+                if policy.source != "unavailable":
+                    self._stored[origin] = {"fetched": policy.fetched, "status": policy.status,
+                                            "lines": policy.lines}
+            data = dict(sorted(self._stored.items()))
+        with open(path, "w", encoding="utf-8") as fout:
+            json.dump(data, fout, indent=1)
+
+    # -- lookups ------------------------------------------------------------
+
+    def _fetch(self, origin: str) -> RobotsPolicy:
+        now = datetime.now(timezone.utc)
+        entry = self._stored.get(origin)
+        if entry:
+            try:
+                fresh = now - datetime.fromisoformat(entry["fetched"]) < self.ttl
+            except (KeyError, ValueError):
+                fresh = False
+            if fresh:
+                return RobotsPolicy(origin, entry["status"], entry["lines"], entry["fetched"], "cached")
+
+        req = urllib.request.Request(f"{origin}/robots.txt", headers={"User-Agent": USER_AGENT})
+        try:
+            with http_pool.urlopen(req, timeout=TIMEOUT) as resp:
+                body = resp.read().decode("utf-8", errors="replace")
+            return RobotsPolicy(origin, resp.status, body.splitlines(), now.isoformat(), "fetched")
+        except urllib.error.HTTPError as exc:
+            if 400 <= exc.code < 500:
+                return RobotsPolicy(origin, exc.code, [], now.isoformat(), "fetched")
+            return RobotsPolicy(origin, exc.code, [], now.isoformat(), "unavailable")
+        except (urllib.error.URLError, OSError):
+            return RobotsPolicy(origin, None, [], now.isoformat(), "unavailable")
+
+    def policy(self, url: str) -> RobotsPolicy:
+        """The policy for *url*'s origin, fetched on first use."""
+        origin = origin_of(url)
+        with self._lock:
+            policy = self._policies.get(origin)
+            if policy is None:
+                policy = self._policies[origin] = self._fetch(origin)
+            return policy
+
+    def allowed(self, url: str) -> bool:
+        policy = self.policy(url)
+        if policy.allowed(url):
+            return True
+        with self._lock:
+            policy.disallowed += 1
+        return False
+
+    def crawl_delay(self, url: str) -> float | None:
+        return self.policy(url).crawl_delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {origin: policy.stats() for origin, policy in sorted(self._policies.items())}
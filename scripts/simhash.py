@@ -0,0 +1,110 @@
+"""
+simhash.py — Streaming 64-bit SimHash fingerprints and a near-duplicate index.
+
+Used by the crawler to spot pages whose extracted text is *almost* the
+same as a page already seen (trailing-slash variants, ``?lang=`` params,
+versioned aliases) — cases an exact content hash misses.
+
+Text is fingerprinted from overlapping 3-word shingles as it is written,
+so a page is never held in memory. Two fingerprints are near-duplicates
+when they differ in at most *threshold* bits. The index splits each
+fingerprint into ``threshold + 1`` bands; by the pigeonhole principle two
+fingerprints within the threshold share at least one band exactly, so a
+lookup only compares against pages in matching band buckets.
+
+Usage:
+    from simhash import SimHash, NearDupIndex
+
+    fp = SimHash()
+    fp.update("some extracted text")
+    index = NearDupIndex(threshold=3)
+    match = index.find(fp.value)      # (key, distance) or None
+    index.add(fp.value, "page-key")
+"""
+
+import hashlib
+
+BITS = 64
+SHINGLE = 3
+
+
+class SimHash:
+    """
+    Incremental SimHash over word shingles.
+
+    Rather than updating 64 counters per shingle, each shingle hash adds
+    one to eight byte-position histograms; the per-bit sums are derived
+    from the histograms once, in :attr:`value`.
+    """
+
+    def __init__(self):
+        self._hist = [[0] * 256 for _ in range(BITS // 8)]
+        self._carry: list[str] = []   # last SHINGLE-1 words of the previous update
+        self.features = 0
+
+    def update(self, text: str) -> None:
+        words = self._carry + text.lower().split()
+        if len(words) < SHINGLE:
+            self._carry = words
+            return
+        hist = self._hist
+        for i in range(len(words) - SHINGLE + 1):
+            digest = hashlib.blake2b(" ".join(words[i:i + SHINGLE]).encode(), digest_size=8).digest()
+            for pos, byte in enumerate(digest):
+                hist[pos][byte] += 1
+        self.features += len(words) - SHINGLE + 1
+        self._carry = words[-(SHINGLE - 1):]
+
+    @property
+    def value(self) -> int | None:
+        """The fingerprint, or None for pages with no words."""
+        if self.features == 0:
+            if not self._carry:
+                return None
+            # Shorter than one shingle: the words themselves are the only feature
+            digest = hashlib.blake2b(" ".join(self._carry).encode(), digest_size=8).digest()
+            return int.from_bytes(digest, "little")
+        half = self.features / 2
+        value = 0
+        for pos, counts in enumerate(self._hist):
+            for bit in range(8):
+                mask = 1 << bit
+                ones = sum(n for byte, n in enumerate(counts) if byte & mask)
+                if ones > half:
+                    value |= 1 << (pos * 8 + bit)
+        return value
+
+
+def distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDupIndex:
+    """Band index over fingerprints for Hamming-distance lookups."""
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = threshold
+        bands = threshold + 1
+        edges = [round(i * BITS / bands) for i in range(bands + 1)]
+        self._bands = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(edges, edges[1:])]
+        self._buckets: dict[tuple[int, int], list[tuple[int, int, str]]] = {}
+        self._added = 0
+
+    def _keys(self, value: int):
+        for i, (shift, mask) in enumerate(self._bands):
+            yield i, (value >> shift) & mask
+
+    def find(self, value: int) -> tuple[str, int] | None:
+        """Closest indexed key within the threshold (earliest added on ties)."""
+        best = None
+        for band in self._keys(value):
+            for other, order, key in self._buckets.get(band, ()):
+                d = distance(value, other)
+                if d <= self.threshold and (best is None or (d, order) < best[0]):
+                    best = ((d, order), key)
+        return (best[1], best[0][0]) if best else None
+
+    def add(self, value: int, key: str) -> None:
+        for band in self._keys(value):
+            self._buckets.setdefault(band, []).append((value, self._added, key))
+        self._added += 1
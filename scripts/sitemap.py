@@ -0,0 +1,143 @@
+"""
+sitemap.py — Sitemap-driven URL discovery for the crawler.
+
+Finds a site's sitemaps (``Sitemap:`` lines in ``robots.txt``, falling back
+to ``/sitemap.xml``), follows sitemap indexes, and stream-parses every
+``<url>`` entry with ``xml.etree.ElementTree.iterparse`` straight off the
+pooled HTTP response, so even a multi-megabyte sitemap is never held in
+memory as a tree.
+
+Usage:
+    import sitemap
+
+    urls, stats = sitemap.discover("https://geminicli.com/docs/")
+    # urls: {"https://geminicli.com/docs/cli": "2025-01-31T00:00:00+00:00", ...}
+"""
+
+import gzip
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import http_pool
+
+USER_AGENT = "DocMaintainer-Crawler/1.0 (+https://github.com/user/DocMaintainer)"
+MAX_SITEMAPS = 50       # sitemap files fetched per site, indexes included
+TIMEOUT = 15
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """
+    Parse a W3C datetime as UTC: ``2025-01-31T10:00:00Z``, ``2025-01-31``,
+    or the reduced forms ``2025-01`` and ``2025``, which mean the start of
+    that month or year. Returns None for anything else.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if re.fullmatch(r"\d{4}", value):
+            parsed = datetime(int(value), 1, 1)
+        elif re.fullmatch(r"\d{4}-\d{2}", value):
+            parsed = datetime(int(value[:4]), int(value[5:]), 1)
+        else:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _get(url: str):
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    return http_pool.urlopen(req, timeout=TIMEOUT)
+
+
+def robots_sitemaps(origin: str) -> list[str]:
+    """``Sitemap:`` URLs advertised by *origin*'s robots.txt."""
+    try:
+        with _get(f"{origin}/robots.txt") as resp:
+            body = resp.read().decode("utf-8", errors="replace")
+    except (urllib.error.URLError, OSError):
+        return []
+    found = []
+    for line in body.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip().lower() == "sitemap" and value.strip():
+            found.append(urllib.parse.urljoin(origin + "/", value.strip()))
+    return found
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_sitemap(url: str):
+    """
+    Yield ``("url", loc, lastmod)`` and ``("sitemap", loc, lastmod)`` entries
+    from one sitemap file, parsing incrementally as the body arrives.
+    """
+    with _get(url) as resp:
+        source = resp
+        if url.endswith(".gz") and "gzip" not in resp.headers.get("Content-Encoding", ""):
+            source = gzip.GzipFile(fileobj=resp)
+        loc = lastmod = None
+        for event, elem in ET.iterparse(source, events=("end",)):
+            tag = _local(elem.tag)
+            if tag == "loc":
+                loc = (elem.text or "").strip()
+            elif tag == "lastmod":
+                lastmod = (elem.text or "").strip()
+            elif tag in ("url", "sitemap"):
+                if loc:
+                    yield tag, loc, lastmod
+                loc = lastmod = None
+                elem.clear()
+
+
+def discover(start_url: str, base_prefix: str | None = None,
+             robots=None) -> tuple[dict[str, str | None], dict]:
+    """
+    Collect page URLs (and their ``lastmod``) from the sitemaps of
+    *start_url*'s site, keeping only those that start with *base_prefix*.
+
+    *robots* is the crawler's ``RobotsCache``; when given, its already
+    fetched robots.txt supplies the ``Sitemap:`` lines instead of a second
+    request.
+
+    Returns ``(urls, stats)``; *urls* preserves sitemap order and is empty
+    when the site publishes no usable sitemap.
+    """
+    parsed = urllib.parse.urlparse(start_url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    base_prefix = base_prefix or origin
+    stats = {"sitemaps": 0, "entries": 0, "in_boundary": 0, "errors": []}
+
+    advertised = robots.policy(start_url).sitemaps if robots is not None else robots_sitemaps(origin)
+    queue = advertised or [f"{origin}/sitemap.xml"]
+    seen: set[str] = set()
+    urls: dict[str, str | None] = {}
+    while queue and stats["sitemaps"] < MAX_SITEMAPS:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        stats["sitemaps"] += 1
+        try:
+            for kind, loc, lastmod in iter_sitemap(sitemap_url):
+                if kind == "sitemap":
+                    queue.append(urllib.parse.urljoin(sitemap_url, loc))
+                    continue
+                stats["entries"] += 1
+                if loc.startswith(base_prefix) and loc not in urls:
+                    urls[loc] = lastmod
+        except urllib.error.HTTPError as exc:
+            stats["errors"].append({"url": sitemap_url, "error": f"HTTP {exc.code}"})
+        except (urllib.error.URLError, OSError, ET.ParseError, EOFError) as exc:
+            stats["errors"].append({"url": sitemap_url, "error": str(exc)})
+    stats["in_boundary"] = len(urls)
+    return urls, stats
@@ -23,13 +23,19 @@ import sys
 import time
 import urllib.request
 import urllib.error
+from datetime import datetime, timezone
 from pathlib import Path
 
+import health_check
+import http_pool
+
 API_BASE = "https://jules.googleapis.com/v1alpha"
 ROOT = Path(__file__).parent.parent
 REPOS_FILE = ROOT / "repos.json"
 DATA_FILE = ROOT / "data" / "last_releases.json"
 REPORTS_DIR = ROOT / "data" / "research_reports"
+DISPATCH_FILE = ROOT / "data" / "last_dispatch.json"
+MAX_PROMPT_SECTIONS = 40
 
 
 def load_repos_config() -> dict:
@@ -100,45 +106,62 @@ def check_research_reports() -> dict[str, str]:
     return reports
 
 
-def check_health_issues() -> dict[str, list[str]]:
-    """Run health check and return {repo_name: [issues]} for repos with problems."""
-    try:
-        result = subprocess.run(
-            [sys.executable, str(ROOT / "scripts" / "health_check.py"), "--json"],
-            capture_output=True, text=True, timeout=60, cwd=str(ROOT),
-        )
-        if result.stdout.strip():
-            data = json.loads(result.stdout)
-            return {k: v for k, v in data.items() if v}  # Only repos with issues
-    except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
-        pass
-
-    # Fallback: run health check and parse text output
-    issues: dict[str, list[str]] = {}
-    try:
-        result = subprocess.run(
-            [sys.executable, str(ROOT / "scripts" / "health_check.py")],
-            capture_output=True, text=True, timeout=60, cwd=str(ROOT),
-        )
-        current_repo = ""
-        for line in result.stdout.splitlines():
-            if line.startswith("⚠️") or line.startswith("❌"):
-                for repo_name in REPOS:
-                    if repo_name in line:
-                        current_repo = repo_name
-                        break
-            if current_repo and ("ISSUE" in line.upper() or "WARNING" in line.upper()):
-                issues.setdefault(current_repo, []).append(line.strip())
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+def check_health_issues(repo_names) -> dict[str, list[str]]:
+    """Run the health check in-process and return {repo_name: [issues]} for repos with problems."""
+    report = health_check.run(repo_names)
+    return report.failing()
+
 
-    return issues
+def load_dispatch_state() -> dict:
+    """Load {repo_name: {"crawl": timestamp, "dispatched": timestamp}} from disk."""
+    if not DISPATCH_FILE.exists():
+        return {}
+    try:
+        with open(DISPATCH_FILE) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_dispatch_state(state: dict) -> None:
+    """Save the dispatch state to disk."""
+    DISPATCH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(DISPATCH_FILE, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def check_changed_sections() -> dict[str, dict]:
+    """Return {repo_name: {"crawl": timestamp, "sections": [...]}} for crawls not yet dispatched.
+
+    A crawl is identified by the timestamp in its _crawl_meta.json (the file's
+    mtime for older summaries without one). Once a session has been created
+    from a crawl, its changed sections are not offered again.
+    """
+    dispatched = load_dispatch_state()
+    changes = {}
+    for repo_name in REPOS:
+        meta_path = ROOT / repo_name / "scraped_docs" / "_crawl_meta.json"
+        if not meta_path.exists():
+            continue
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            crawl = meta.get("timestamp") or datetime.fromtimestamp(
+                meta_path.stat().st_mtime, timezone.utc).isoformat()
+        except (OSError, json.JSONDecodeError):
+            continue
+        sections = meta.get("changed_sections", [])
+        last = dispatched.get(repo_name, {}).get("crawl", "")
+        if sections and crawl > last:
+            changes[repo_name] = {"crawl": crawl, "sections": sections}
+    return changes
 
 
 def build_smart_targets(targets: dict) -> dict:
     """Filter targets to only repos that need updating."""
     new_releases = check_new_releases()
     research = check_research_reports()
+    sections = check_changed_sections()
 
     smart_targets = {}
     for repo_name, config in targets.items():
@@ -147,6 +170,8 @@ def build_smart_targets(targets: dict) -> dict:
             reasons.append("new release")
         if repo_name in research:
             reasons.append("research available")
+        if repo_name in sections:
+            reasons.append(f"{len(sections[repo_name]['sections'])} changed section(s)")
         if reasons:
             smart_targets[repo_name] = config
             print(f"  ✅ {repo_name}: dispatching ({', '.join(reasons)})")
@@ -176,10 +201,32 @@ def build_research_prompt(repo_name: str, base_prompt: str, reports: dict[str, s
     )
 
 
+def build_sections_prompt(base_prompt: str, sections: list[dict]) -> str:
+    """Point the prompt at the sections that changed in the last crawl."""
+    if not sections:
+        return base_prompt
+
+    lines = [
+        f"- [{s['change']}] {s['title'] or '(page intro)'} — {s['link']}"
+        for s in sections[:MAX_PROMPT_SECTIONS]
+    ]
+    if len(sections) > MAX_PROMPT_SECTIONS:
+        lines.append(f"- ...and {len(sections) - MAX_PROMPT_SECTIONS} more (see scraped_docs/_crawl_meta.json)")
+    section_list = "\n".join(lines)
+    return (
+        f"{base_prompt}\n\n"
+        f"## Changed Sections\n\n"
+        f"The last crawl found changes only in these sections of the official docs. "
+        f"Focus your updates on the matching parts of docs/; other sections are unchanged:\n\n"
+        f"{section_list}"
+    )
+
+
 def build_health_fix_prompt(repo_name: str, issues: list[str]) -> str:
     """Build a focused prompt to fix health check issues."""
-    issue_items = list(issues) if isinstance(issues, dict) else list(issues)
-    issue_list = "\n".join(f"- {issue}" for issue in issue_items[:10])
+    issue_list = "\n".join(f"- {issue}" for issue in issues[:10])
+    if len(issues) > 10:
+        issue_list += f"\n- ...and {len(issues) - 10} more (run `python scripts/health_check.py`)"
     return (
         f"Fix the following documentation health check issues in this repository. "
         f"Follow the instructions in JULES.md for formatting standards.\n\n"
@@ -187,7 +234,7 @@ def build_health_fix_prompt(repo_name: str, issues: list[str]) -> str:
         f"{issue_list}\n\n"
         f"For stub files (< 15 lines), expand them with real content from the official "
         f"documentation. For broken links, check docs/official-links.md and replace with "
-        f"working URLs. For missing files, create them following the existing doc structure.\n\n"
+        f"working URLs; for broken anchors, point the #fragment at an existing heading. For missing files, create them following the existing doc structure.\n\n"
         f"Commit with: 'fix: resolve health check issues [automated]'"
     )
 
@@ -208,9 +255,11 @@ def jules_request(
     }
     data = json.dumps(body).encode() if body else None
     req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    # Only idempotent reads are retried; a retried POST could create a duplicate session
+    retry = http_pool.RetryPolicy() if method == "GET" else None
 
     try:
-        with urllib.request.urlopen(req) as resp:
+        with http_pool.urlopen(req, timeout=60, retry=retry) as resp:
             return json.loads(resp.read().decode())
     except urllib.error.HTTPError as e:
         error_body = e.read().decode() if e.fp else ""
@@ -416,11 +465,17 @@ def main() -> None:
     if research:
         print(f"📊 Research available for: {', '.join(research.keys())}\n")
 
+    # Changed sections from the last crawl narrow the standard prompts (once per crawl)
+    changed_sections = check_changed_sections()
+    if changed_sections:
+        print(f"🧩 Changed sections for: {', '.join(changed_sections.keys())}\n")
+    dispatch_state = load_dispatch_state()
+
     # Health-fix mode: override prompts with targeted fix tasks
     health_issues: dict[str, list[str]] = {}
     if args.from_health_check:
         print("🏥 Checking for health issues...")
-        health_issues = check_health_issues()
+        health_issues = check_health_issues(targets)
         if health_issues:
             print(f"  Found issues in: {', '.join(health_issues.keys())}")
             # Only target repos with issues
@@ -458,6 +513,9 @@ def main() -> None:
         else:
             prompt = config["prompt"]
             title = config["title"]
+        crawl = None if args.from_health_check else changed_sections.get(repo_name)
+        if crawl:
+            prompt = build_sections_prompt(prompt, crawl["sections"])
 
         print(f"{'[DRY RUN] ' if args.dry_run else ''}Creating session for {full_name}...")
 
@@ -484,6 +542,12 @@ def main() -> None:
             print(f"  ✅ Session created: {session_id}")
             results.append({"repo": repo_name, "session_id": session_id, "status": "ok"})
             session_ids[repo_name] = session_id
+            if crawl:
+                dispatch_state[repo_name] = {
+                    "crawl": crawl["crawl"],
+                    "dispatched": datetime.now(timezone.utc).isoformat(),
+                }
+                save_dispatch_state(dispatch_state)
         except Exception as e:
             print(f"  ❌ Failed: {e}", file=sys.stderr)
             results.append({"repo": repo_name, "error": str(e), "status": "error"})